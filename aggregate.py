@@ -0,0 +1,267 @@
+import argparse
+import json
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+
+from game import (
+    Game,
+    PLAYER,
+    OPPONENT,
+    TIE,
+    TOTAL_OFFSET,
+    basic_player_policy,
+    EVENT_ROUND_START,
+    EVENT_PLAYER_DRAW,
+    EVENT_OPPONENT_DRAW,
+    EVENT_ROUND_END,
+    EVENT_MATCH_END,
+)
+from tournament import CHUNK_SIZE, chunk_rng
+
+Z_95: float = 1.959964
+CHECKPOINT_VERSION: int = 2
+
+
+def wilson_interval(successes: int, trials: int, z: float = Z_95) -> tuple[float, float]:
+    """Return the Wilson score confidence interval of a binomial rate."""
+    if not trials:
+        return 0.0, 1.0
+    rate: float = successes / trials
+    denominator: float = 1 + z * z / trials
+    centre: float = (rate + z * z / (2 * trials)) / denominator
+    margin: float = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def percentile(sorted_values: list[int], fraction: float) -> float:
+    """Return the nearest-rank percentile of an already sorted list."""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+@dataclass(slots=True)
+class OutcomeStats:
+    """Constant-size running aggregate of round and match outcomes.
+
+    Results are counted by PLAYER/OPPONENT/TIE. Final totals are histograms indexed by
+    total + TOTAL_OFFSET, so the bust rate at any total is read off directly. Hand card usage is
+    kept per seat as the number of hand cards played per round and the signed values played
+    (indexed by value + 10). Every field is a count, so merging is plain addition.
+    """
+
+    matches: list[int] = field(default_factory=lambda: [0] * 4)
+    rounds: list[int] = field(default_factory=lambda: [0] * 4)
+    player_totals: list[int] = field(default_factory=lambda: [0] * (2 * TOTAL_OFFSET))
+    opponent_totals: list[int] = field(default_factory=lambda: [0] * (2 * TOTAL_OFFSET))
+    player_plays_per_round: list[int] = field(default_factory=lambda: [0] * 5)
+    opponent_plays_per_round: list[int] = field(default_factory=lambda: [0] * 5)
+    player_cards_played: list[int] = field(default_factory=lambda: [0] * 21)
+    opponent_cards_played: list[int] = field(default_factory=lambda: [0] * 21)
+
+    def add_round(
+        self,
+        result: int,
+        player_total: int,
+        opponent_total: int,
+        player_played: list[int],
+        opponent_played: list[int],
+    ) -> None:
+        """Count one finished round: its result, both final totals and the hand cards each side played."""
+        self.rounds[result] += 1
+        self.player_totals[player_total + TOTAL_OFFSET] += 1
+        self.opponent_totals[opponent_total + TOTAL_OFFSET] += 1
+        self.player_plays_per_round[min(len(player_played), 4)] += 1
+        self.opponent_plays_per_round[min(len(opponent_played), 4)] += 1
+        for card in player_played:
+            self.player_cards_played[card + 10] += 1
+        for card in opponent_played:
+            self.opponent_cards_played[card + 10] += 1
+
+    def add_match(self, winner: int) -> None:
+        """Count one finished match."""
+        self.matches[winner] += 1
+
+    def merge(self, other: "OutcomeStats") -> None:
+        """Add the counts of another aggregate, e.g. from a worker process, to this one."""
+        for name in self.__slots__:
+            mine: list[int] = getattr(self, name)
+            for idx, count in enumerate(getattr(other, name)):
+                mine[idx] += count
+
+    def rate(self, counts: list[int], result: int) -> tuple[float, float, float]:
+        """Return (rate, low, high) of one result among the counted rounds or matches, with a 95% interval."""
+        trials: int = sum(counts)
+        low, high = wilson_interval(counts[result], trials)
+        return (counts[result] / trials if trials else 0.0), low, high
+
+    def bust_rate(self, totals: list[int]) -> float:
+        """Return the fraction of rounds one seat finished over 20."""
+        rounds: int = sum(totals)
+        return sum(totals[TOTAL_OFFSET + 21 :]) / rounds if rounds else 0.0
+
+    def total_distribution(self, totals: list[int]) -> dict[int, float]:
+        """Return the share of rounds finished at each final total that occurred."""
+        rounds: int = sum(totals)
+        return {idx - TOTAL_OFFSET: count / rounds for idx, count in enumerate(totals) if count}
+
+    def summary(self) -> str:
+        """Return a readable summary of the rates, intervals, bust rates and hand card usage."""
+        lines: list[str] = [f"matches={sum(self.matches)} rounds={sum(self.rounds)}"]
+        for label, counts in (("match", self.matches), ("round", self.rounds)):
+            for name, result in (("player", PLAYER), ("opponent", OPPONENT), ("tie", TIE)):
+                rate, low, high = self.rate(counts, result)
+                lines.append(f"{label} {name:<8} {rate:.4f}  95% CI [{low:.4f}, {high:.4f}]")
+        lines.append(
+            f"bust rate player={self.bust_rate(self.player_totals):.4f} "
+            f"opponent={self.bust_rate(self.opponent_totals):.4f}"
+        )
+        lines.append(
+            f"hand cards per round player={self.player_plays_per_round} opponent={self.opponent_plays_per_round}"
+        )
+        return "\n".join(lines)
+
+    def save(self, path: str, chunks_done: int = 0, seed: int = 0, matches: int = 0) -> None:
+        """Write the aggregate and the run position to a small JSON checkpoint, replacing it atomically."""
+        temporary: str = path + ".tmp"
+        data: dict = {
+            "version": CHECKPOINT_VERSION,
+            "seed": seed,
+            "matches": matches,
+            "chunks_done": chunks_done,
+            "stats": asdict(self),
+        }
+        with open(temporary, "w") as file:
+            json.dump(data, file)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> tuple["OutcomeStats", int, int, int]:
+        """Read a checkpoint and return (stats, chunks_done, seed, matches)."""
+        with open(path) as file:
+            data: dict = json.load(file)
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} checkpoint")
+        return cls(**data["stats"]), data["chunks_done"], data["seed"], data["matches"]
+
+
+class OutcomeRecorder:
+    """Game recorder that feeds an OutcomeStats as rounds and matches end.
+
+    Hand card plays are found at the end of each round by removing the cards drawn from the main
+    deck (known from the draw events) from each board, so only per-round draw counts are kept.
+    """
+
+    def __init__(self, stats: OutcomeStats) -> None:
+        """Feed the given aggregate; set game before the first event."""
+        self.stats: OutcomeStats = stats
+        self.game: Game | None = None
+        self.player_drawn: list[int] = [0] * 11
+        self.opponent_drawn: list[int] = [0] * 11
+
+    def __call__(self, event: int, value: int) -> None:
+        """Track draws and count finished rounds and matches."""
+        if event == EVENT_PLAYER_DRAW:
+            self.player_drawn[value] += 1
+        elif event == EVENT_OPPONENT_DRAW:
+            self.opponent_drawn[value] += 1
+        elif event == EVENT_ROUND_START:
+            self.player_drawn[:] = [0] * 11
+            self.opponent_drawn[:] = [0] * 11
+        elif event == EVENT_ROUND_END:
+            game: Game = self.game
+            self.stats.add_round(
+                value,
+                game.player_total,
+                game.opponent_total,
+                hand_cards_played(game.player_board, self.player_drawn),
+                hand_cards_played(game.opponent_board, self.opponent_drawn),
+            )
+        elif event == EVENT_MATCH_END:
+            self.stats.add_match(value)
+
+
+def hand_cards_played(board: list[int], drawn: list[int]) -> list[int]:
+    """Return the board cards left after removing the given counts of drawn main deck cards."""
+    remaining: list[int] = list(drawn)
+    played: list[int] = []
+    for card in board:
+        if 0 < card <= 10 and remaining[card]:
+            remaining[card] -= 1
+        else:
+            played.append(card)
+    return played
+
+
+def aggregate_chunk(seed: int, index: int, matches: int) -> OutcomeStats:
+    """Play one chunk of matches with its seeded RNG stream and return its aggregate."""
+    stats: OutcomeStats = OutcomeStats()
+    recorder: OutcomeRecorder = OutcomeRecorder(stats)
+    game: Game = Game(chunk_rng(seed, index), recorder=recorder)
+    recorder.game = game
+    for _ in range(matches):
+        game.play_match(basic_player_policy)
+    return stats
+
+
+def run_aggregate(
+    matches: int,
+    seed: int = 0,
+    workers: int | None = None,
+    checkpoint: str | None = None,
+    checkpoint_every: float = 30.0,
+) -> OutcomeStats:
+    """Aggregate matches across a process pool in bounded memory, resuming from a checkpoint if one exists.
+
+    Chunks are seeded like tournament chunks and merged in chunk order, with only a few chunks in
+    flight per worker. The checkpoint stores the merged aggregate and how many leading chunks it
+    covers, so an interrupted run continues where it stopped and ends with the same totals.
+    """
+    stats: OutcomeStats = OutcomeStats()
+    chunks_done: int = 0
+    if checkpoint is not None and os.path.exists(checkpoint):
+        stats, chunks_done, saved_seed, saved_matches = OutcomeStats.load(checkpoint)
+        if saved_seed != seed:
+            raise ValueError(f"{checkpoint} was written for seed {saved_seed}, not {seed}")
+        if saved_matches != matches:
+            raise ValueError(f"{checkpoint} was written for {saved_matches} matches, not {matches}")
+    chunk_count: int = (matches + CHUNK_SIZE - 1) // CHUNK_SIZE
+    next_save: float = time.monotonic() + checkpoint_every
+    window: int = 4 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future] = deque()
+        next_chunk: int = chunks_done
+        while chunks_done < chunk_count:
+            while next_chunk < chunk_count and len(pending) < window:
+                size: int = min(CHUNK_SIZE, matches - next_chunk * CHUNK_SIZE)
+                pending.append(executor.submit(aggregate_chunk, seed, next_chunk, size))
+                next_chunk += 1
+            stats.merge(pending.popleft().result())
+            chunks_done += 1
+            if checkpoint is not None and time.monotonic() >= next_save:
+                stats.save(checkpoint, chunks_done, seed, matches)
+                next_save = time.monotonic() + checkpoint_every
+    if checkpoint is not None:
+        stats.save(checkpoint, chunks_done, seed, matches)
+    return stats
+
+
+def main() -> None:
+    """Run a checkpointed aggregate from the command line and print the summary."""
+    parser = argparse.ArgumentParser(description="Aggregate outcome statistics over many headless Pazaak matches.")
+    parser.add_argument("--matches", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--checkpoint", default=None, help="JSON file to resume from and save progress to")
+    parser.add_argument("--checkpoint-every", type=float, default=30.0, help="seconds between checkpoints")
+    args = parser.parse_args()
+    started: float = time.perf_counter()
+    stats: OutcomeStats = run_aggregate(args.matches, args.seed, args.workers, args.checkpoint, args.checkpoint_every)
+    print(stats.summary())
+    print(f"{time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+
+from game import Game, END_TURN, STAND, PLAY_CARD, INVERT_CARD, EVENT_ACTION, Snapshot
+from matchlog import MatchLog
+from solver import Solver, PLAY_POSITIVE, PLAY_NEGATIVE, game_state, state_key
+
+# Matches per analysis task; a worker keeps its solvers and grade cache across all of its tasks.
+TASK_MATCHES: int = 200
+# Round value lost by a move, on the -1 (loss) to 1 (win) scale, from which it is reported as a blunder.
+BLUNDER_LOSS: float = 0.1
+# Value of a hand card kept for a later round, on the same scale: the solver's mean value of a round
+# started with one hand card minus that of one started with none, over 150 random round starts each.
+CARD_VALUE: float = 0.53
+
+
+@dataclass(slots=True)
+class MoveGrade:
+    """Grade of one recorded player move against the best response to the built-in opponent."""
+
+    log: str
+    match: int
+    move: int
+    player_total: int
+    opponent_total: int
+    action: str
+    value: float
+    best_value: float
+    best_action: str
+    loss: float
+
+
+def action_name(action: int) -> str:
+    """Return a readable name of a solver action."""
+    if action == END_TURN:
+        return "draw"
+    if action == STAND:
+        return "pass"
+    if action < PLAY_NEGATIVE:
+        return f"play +{action - PLAY_POSITIVE + 1}"
+    return f"play -{action - PLAY_NEGATIVE + 1}"
+
+
+def solver_action(game: Game, action: int) -> int | None:
+    """Translate a recorded Game.step action into the solver action it decides, or None if it decides nothing.
+
+    Inverting a card decides nothing until the card is played, which is where a bad invert is
+    charged, and plays after the turn's hand card are no-ops.
+    """
+    if action in (END_TURN, STAND):
+        return action
+    index: int = action - PLAY_CARD
+    if action >= INVERT_CARD or game.hand_card_played or index >= len(game.player_hand):
+        return None
+    card: int = game.player_hand[index]
+    return (PLAY_POSITIVE if card > 0 else PLAY_NEGATIVE) + abs(card) - 1
+
+
+def kept_card_values(player_rounds_won: int, opponent_rounds_won: int) -> tuple[float, ...]:
+    """Return the value of keeping 0-4 hand cards past the current round of a match.
+
+    Each kept card is worth CARD_VALUE in one later round, so at most as many cards count as rounds
+    may follow, and the total is scaled by the share of decided outcomes after which the match goes
+    on. A tied round counts for both sides, so it ends the match whenever a decided round would.
+    """
+    rounds_left: int = max(0, 2 - player_rounds_won) + max(0, 2 - opponent_rounds_won)
+    weight: float = ((player_rounds_won < 2) + (opponent_rounds_won < 2)) / 2
+    return tuple(weight * CARD_VALUE * min(cards, rounds_left) for cards in range(5))
+
+
+def action_value(solver: Solver, state: tuple, action: int) -> float:
+    """Return the expected round result plus the value of the cards kept, after a solver action at a decision point."""
+    total, opponent_total, hand, opponent_hand, opponent_passed, _ = state
+    if action == STAND:
+        return solver.stand_value(total, opponent_total, opponent_hand, opponent_passed) + solver.kept_value(hand)
+    if action == END_TURN:
+        return solver.end_turn_value(total, opponent_total, hand, opponent_hand, opponent_passed)
+    if action < PLAY_NEGATIVE:
+        card, sign = action - PLAY_POSITIVE + 1, 1
+    else:
+        card, sign = action - PLAY_NEGATIVE + 1, -1
+    rest: list[int] = list(hand)
+    rest.remove(card)
+    return solver.solve(total + sign * card, opponent_total, tuple(rest), opponent_hand, opponent_passed, True)[0]
+
+
+class Grader:
+    """Grades decision points with memoized solvers and caches grades of positions seen in earlier games.
+
+    Solver values only cover the current round, so hand cards still held at its end are credited
+    with kept_card_values of the match score; otherwise spending a card would cost nothing and the
+    grader would rate burning cards as best play. There is one solver per set of card values, since
+    its memo depends on them.
+    """
+
+    def __init__(self) -> None:
+        """Start with no solvers and an empty grade cache."""
+        self.solvers: dict[tuple[float, ...], Solver] = {}
+        self.cache: dict[tuple[int, tuple[float, ...], int], tuple[float, float, int]] = {}
+        self.hits: int = 0
+        self.lookups: int = 0
+
+    def grade(self, state: tuple, action: int, hand_values: tuple[float, ...] = ()) -> tuple[float, float, int]:
+        """Return (value, best value, best solver action) of a solver action at a player decision point."""
+        cache_key: tuple[int, tuple[float, ...], int] = (state_key(*state), hand_values, action)
+        self.lookups += 1
+        grade: tuple[float, float, int] | None = self.cache.get(cache_key)
+        if grade is not None:
+            self.hits += 1
+            return grade
+        solver: Solver | None = self.solvers.get(hand_values)
+        if solver is None:
+            solver = self.solvers[hand_values] = Solver(hand_values)
+        value: float = action_value(solver, state, action)
+        best_value, best_action = solver.solve(*state)
+        grade = (value, best_value, best_action) if best_value > value else (value, value, action)
+        self.cache[cache_key] = grade
+        return grade
+
+    def analyze_match(self, log: MatchLog, path: str, match_id: int) -> list[MoveGrade]:
+        """Replay one recorded match and grade every player decision in it."""
+        grades: list[MoveGrade] = []
+        scratch: Game = Game()
+        before: Snapshot | None = None
+        move: int = 0
+        for event, value, game in log.replay(match_id):
+            if event == EVENT_ACTION and before is not None and not before.player_passed:
+                scratch.restore(before)
+                action: int | None = solver_action(scratch, value)
+                if action is not None:
+                    hand_values: tuple[float, ...] = kept_card_values(
+                        scratch.player_rounds_won, scratch.opponent_rounds_won
+                    )
+                    chosen, best_value, best_action = self.grade(game_state(scratch), action, hand_values)
+                    grades.append(
+                        MoveGrade(
+                            path,
+                            match_id,
+                            move,
+                            scratch.player_total,
+                            scratch.opponent_total,
+                            action_name(action),
+                            chosen,
+                            best_value,
+                            action_name(best_action),
+                            best_value - chosen,
+                        )
+                    )
+                move += 1
+            before = game.snapshot()
+        return grades
+
+
+# The grader of a worker process, shared by every task it runs so repeated positions are graded once.
+_grader: Grader | None = None
+
+
+def analyze_task(path: str, first: int, count: int) -> tuple[list[MoveGrade], int, int]:
+    """Grade a range of matches of one log and return the grades and this task's grade cache (hits, lookups)."""
+    global _grader
+    if _grader is None:
+        _grader = Grader()
+    hits, lookups = _grader.hits, _grader.lookups
+    log: MatchLog = MatchLog(path)
+    try:
+        grades: list[MoveGrade] = []
+        for match_id in range(first, min(first + count, len(log))):
+            grades.extend(_grader.analyze_match(log, path, match_id))
+    finally:
+        log.close()
+    return grades, _grader.hits - hits, _grader.lookups - lookups
+
+
+def log_paths(paths: list[str]) -> list[str]:
+    """Expand directories to the match logs they contain, in name order."""
+    found: list[str] = []
+    for path in paths:
+        found.extend(sorted(glob.glob(os.path.join(path, "*.log"))) if os.path.isdir(path) else [path])
+    return found
+
+
+def analyze(paths: list[str], output: str, workers: int | None = None) -> dict:
+    """Grade every match of the given logs in parallel, write one JSON line per move and return a summary.
+
+    Moves are written in log and match order. Values are expected round results (1 win, -1 loss)
+    against the built-in opponent, plus the value of the hand cards kept for later rounds, so games
+    against another opponent are graded as if it had played. They are approximate: the solver draws
+    with replacement from the full deck (solver.DRAW_ODDS) rather than from the cards left in it.
+    """
+    tasks: list[tuple[str, int, int]] = []
+    for path in log_paths(paths):
+        log: MatchLog = MatchLog(path)
+        tasks.extend((path, first, min(TASK_MATCHES, len(log) - first)) for first in range(0, len(log), TASK_MATCHES))
+        log.close()
+    summary: dict = {"matches": 0, "moves": 0, "blunders": 0, "total_loss": 0.0, "cache_hits": 0, "lookups": 0}
+    with ProcessPoolExecutor(max_workers=workers) as executor, open(output, "w") as file:
+        results = executor.map(analyze_task, *zip(*tasks)) if tasks else []
+        for (_, _, count), (grades, hits, lookups) in zip(tasks, results):
+            summary["matches"] += count
+            summary["moves"] += len(grades)
+            summary["blunders"] += sum(grade.loss >= BLUNDER_LOSS for grade in grades)
+            summary["total_loss"] += sum(grade.loss for grade in grades)
+            summary["cache_hits"] += hits
+            summary["lookups"] += lookups
+            for grade in grades:
+                file.write(json.dumps(asdict(grade)) + "\n")
+    return summary
+
+
+def main() -> None:
+    """Grade recorded games from the command line and write per-move blunder scores."""
+    parser = argparse.ArgumentParser(description="Grade the player's moves in recorded Pazaak games.")
+    parser.add_argument("logs", nargs="+", help="match logs, or directories of them such as games/")
+    parser.add_argument("--output", default="analysis.jsonl", help="JSON lines file of graded moves")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    started: float = time.perf_counter()
+    summary: dict = analyze(args.logs, args.output, args.workers)
+    elapsed: float = time.perf_counter() - started
+    moves: int = summary["moves"]
+    print(
+        f"{summary['matches']} matches, {moves} moves graded, {summary['blunders']} blunders "
+        f"(loss >= {BLUNDER_LOSS}), mean loss {summary['total_loss'] / moves if moves else 0.0:.4f}"
+    )
+    print(f"grade cache hit rate {summary['cache_hits'] / max(summary['lookups'], 1):.1%}, {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
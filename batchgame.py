@@ -0,0 +1,183 @@
+import numpy as np
+
+from game import NO_RESULT, PLAYER, OPPONENT, TIE, MAIN_DECK_COUNTS, HAND_DECK_COUNTS
+
+
+class BatchGame:
+    """N independent Pazaak matches stored as NumPy arrays and advanced in lockstep.
+
+    Both seats follow the engine's built-in rules: the opponent mirrors Game.opponent_turn and the
+    player mirrors game.basic_player_policy. Hand cards are stored by absolute value, with 0 marking
+    a used slot, since the player's sign is chosen when a card is played.
+    """
+
+    def __init__(self, size: int, rng: np.random.Generator | None = None) -> None:
+        """Allocate the state arrays for size matches and deal the first game."""
+        self.size: int = size
+        self.rng: np.random.Generator = rng if rng is not None else np.random.default_rng()
+        self.deck: np.ndarray = np.zeros((size, 10), dtype=np.int8)
+        self.deck_size: np.ndarray = np.zeros(size, dtype=np.int16)
+        self.player_hand: np.ndarray = np.zeros((size, 4), dtype=np.int16)
+        self.opponent_hand: np.ndarray = np.zeros((size, 4), dtype=np.int16)
+        self.player_total: np.ndarray = np.zeros(size, dtype=np.int16)
+        self.opponent_total: np.ndarray = np.zeros(size, dtype=np.int16)
+        self.player_passed: np.ndarray = np.zeros(size, dtype=bool)
+        self.opponent_passed: np.ndarray = np.zeros(size, dtype=bool)
+        self.player_rounds_won: np.ndarray = np.zeros(size, dtype=np.int8)
+        self.opponent_rounds_won: np.ndarray = np.zeros(size, dtype=np.int8)
+        self.winner: np.ndarray = np.zeros(size, dtype=np.int8)
+        self.rounds_played: int = 0
+        self.reset_game()
+
+    def reset_game(self) -> None:
+        """Start a new match in every slot."""
+        everything: np.ndarray = np.ones(self.size, dtype=bool)
+        self.player_rounds_won[:] = 0
+        self.opponent_rounds_won[:] = 0
+        self.winner[:] = NO_RESULT
+        self.rounds_played = 0
+        self.player_hand[:] = self.draw_hands()
+        self.opponent_hand[:] = self.draw_hands()
+        self.reset_round(everything)
+
+    def draw_hands(self) -> np.ndarray:
+        """Draw four hand cards without replacement from a fresh hand deck for every match."""
+        hand_deck: np.ndarray = np.repeat(np.arange(1, 11, dtype=np.int16), HAND_DECK_COUNTS)
+        keys: np.ndarray = self.rng.random((self.size, hand_deck.size))
+        return hand_deck[np.argsort(keys, axis=1)[:, :4]]
+
+    def reset_round(self, mask: np.ndarray) -> None:
+        """Reset the round state of the masked matches and draw the player's opening card."""
+        self.deck[mask] = MAIN_DECK_COUNTS
+        self.deck_size[mask] = sum(MAIN_DECK_COUNTS)
+        self.player_total[mask] = 0
+        self.opponent_total[mask] = 0
+        self.player_passed[mask] = False
+        self.opponent_passed[mask] = False
+        self.player_total += self.draw_cards(mask)
+
+    def draw_cards(self, mask: np.ndarray) -> np.ndarray:
+        """Draw one card from the main deck of every masked match with cards left, returning 0 elsewhere."""
+        cards: np.ndarray = np.zeros(self.size, dtype=np.int16)
+        rows: np.ndarray = np.flatnonzero(mask & (self.deck_size > 0))
+        if rows.size == 0:
+            return cards
+        r: np.ndarray = (self.rng.random(rows.size) * self.deck_size[rows]).astype(np.int16)
+        cumulative: np.ndarray = np.cumsum(self.deck[rows], axis=1)
+        idx: np.ndarray = np.argmax(cumulative > r[:, None], axis=1)
+        self.deck[rows, idx] -= 1
+        self.deck_size[rows] -= 1
+        cards[rows] = idx + 1
+        return cards
+
+    def running(self) -> np.ndarray:
+        """Return the mask of matches that have not been decided yet."""
+        return self.winner == NO_RESULT
+
+    def step(self) -> None:
+        """Advance every running match by one full turn: player decision, opponent turn and player draw."""
+        ongoing: np.ndarray = self.running()
+        self.player_phase(ongoing)
+        ongoing &= ~(self.player_passed & self.opponent_passed)
+        self.opponent_phase(ongoing)
+        ongoing &= ~(self.player_passed & self.opponent_passed)
+        draw: np.ndarray = ongoing & ~self.player_passed
+        self.player_total += self.draw_cards(draw)
+        self.player_passed |= draw & (self.player_total == 20)
+        self.resolve_rounds(self.running() & self.player_passed & self.opponent_passed)
+
+    def play_matches(self) -> np.ndarray:
+        """Play every match to completion and return the winner of each one."""
+        while self.running().any():
+            self.step()
+        return self.winner.copy()
+
+    def player_phase(self, mask: np.ndarray) -> None:
+        """Apply the basic player policy: play at most one hand card, then stand or end the turn."""
+        deciding: np.ndarray = mask & ~self.player_passed
+        total: np.ndarray = self.player_total
+        hand: np.ndarray = self.player_hand
+        behind: np.ndarray = self.opponent_passed & (total < self.opponent_total) & (self.opponent_total <= 20)
+        bust: np.ndarray = deciding & (total > 20)
+        reduce_fits: np.ndarray = (hand > 0) & (total[:, None] - hand <= 20)
+        self.play_first(bust, reduce_fits, hand, total, -1)
+        chasing: np.ndarray = deciding & ~bust & ((total < 17) | behind)
+        new_sum: np.ndarray = total[:, None] + hand
+        reach_fits: np.ndarray = (
+            (hand > 0)
+            & (new_sum >= 17)
+            & (new_sum <= 20)
+            & (~self.opponent_passed[:, None] | (new_sum >= self.opponent_total[:, None]))
+        )
+        self.play_first(chasing, reach_fits, hand, total, 1)
+        behind = self.opponent_passed & (total < self.opponent_total) & (self.opponent_total <= 20)
+        stand: np.ndarray = deciding & (total >= 17) & (total <= 20) & ~behind
+        self.player_passed |= stand
+
+    def opponent_phase(self, mask: np.ndarray) -> None:
+        """Run Game.advance_opponent for the masked matches, including the opponent's decision tree."""
+        player_total: np.ndarray = self.player_total
+        player_bust: np.ndarray = mask & ~self.player_passed & (player_total > 20)
+        self.player_passed |= player_bust
+        self.opponent_passed |= player_bust
+        mask = mask & ~player_bust
+        self.player_passed |= mask & (player_total == 20)
+        moving: np.ndarray = mask & ~self.opponent_passed
+        total: np.ndarray = self.opponent_total
+        total += self.draw_cards(moving)
+        hand: np.ndarray = self.opponent_hand
+
+        bust: np.ndarray = moving & (total > 20)
+        used: np.ndarray = self.play_first(bust, (hand > 0) & (total[:, None] - hand <= 20), hand, total, -1)
+        self.opponent_passed |= used & (total >= 17) & (total <= 20) & (total >= player_total)
+        rest: np.ndarray = moving & ~bust
+
+        settled: np.ndarray = rest & self.player_passed & (total >= player_total)
+        self.opponent_passed |= settled
+        rest &= ~settled
+
+        new_sum: np.ndarray = total[:, None] + hand
+        improving: np.ndarray = rest & (total >= 17) & (total < player_total)
+        self.play_first(improving, (hand > 0) & (new_sum <= 20) & (new_sum >= player_total[:, None]), hand, total, 1)
+        self.opponent_passed |= rest & (total >= 17)
+
+        reaching: np.ndarray = moving & ~bust & ~settled & ~self.opponent_passed & (total < 17)
+        reach_fits: np.ndarray = (hand > 0) & (new_sum >= 17) & (new_sum <= 20) & (new_sum >= player_total[:, None])
+        used = self.play_first(reaching, reach_fits, hand, total, 1)
+        self.opponent_passed |= used
+
+        over: np.ndarray = mask & (total > 20)
+        self.player_passed |= over
+        self.opponent_passed |= over | (mask & (total == 20))
+        empty: np.ndarray = mask & (self.deck_size == 0)
+        self.player_passed |= empty
+        self.opponent_passed |= empty
+
+    @staticmethod
+    def play_first(mask: np.ndarray, fits: np.ndarray, hand: np.ndarray, total: np.ndarray, sign: int) -> np.ndarray:
+        """Play the first fitting hand card with the given sign in every masked match and return where one was played."""
+        fits = fits & mask[:, None]
+        used: np.ndarray = fits.any(axis=1)
+        rows: np.ndarray = np.flatnonzero(used)
+        slots: np.ndarray = np.argmax(fits[rows], axis=1)
+        total[rows] += sign * hand[rows, slots]
+        hand[rows, slots] = 0
+        return used
+
+    def resolve_rounds(self, mask: np.ndarray) -> None:
+        """Score the masked finished rounds, record match winners and start the next round where undecided."""
+        if not mask.any():
+            return
+        player_total: np.ndarray = self.player_total
+        opponent_total: np.ndarray = self.opponent_total
+        opponent_wins: np.ndarray = (player_total > 20) | ((opponent_total <= 20) & (opponent_total > player_total))
+        player_wins: np.ndarray = ~opponent_wins & ((opponent_total > 20) | (player_total > opponent_total))
+        self.player_rounds_won += mask & ~opponent_wins
+        self.opponent_rounds_won += mask & ~player_wins
+        self.rounds_played += int(mask.sum())
+        player_done: np.ndarray = self.player_rounds_won >= 3
+        opponent_done: np.ndarray = self.opponent_rounds_won >= 3
+        self.winner[mask & player_done & opponent_done] = TIE
+        self.winner[mask & player_done & ~opponent_done] = PLAYER
+        self.winner[mask & opponent_done & ~player_done] = OPPONENT
+        self.reset_round(mask & self.running())
@@ -0,0 +1,255 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Callable
+
+from aggregate import percentile
+from game import Game, NO_RESULT, END_TURN, MAIN_DECK_COUNTS, HAND_DECK_COUNTS, basic_player_policy
+
+SEED: int = 20240101
+
+
+def bench_draw_card(seed: int) -> Callable[[], None]:
+    """Draw one card from the main deck, refilling the deck in place whenever it runs out."""
+    game: Game = Game(random.Random(seed))
+
+    def op() -> None:
+        if not game.deck_size:
+            game.deck[:] = MAIN_DECK_COUNTS
+            game.deck_size = sum(MAIN_DECK_COUNTS)
+        game.draw_card()
+
+    return op
+
+
+def bench_draw_hand(seed: int) -> Callable[[], None]:
+    """Deal both hands from freshly refilled hand decks."""
+    game: Game = Game(random.Random(seed))
+
+    def op() -> None:
+        game.player_hand_deck[:] = HAND_DECK_COUNTS
+        game.player_hand_deck_size = sum(HAND_DECK_COUNTS)
+        game.opponent_hand_deck[:] = HAND_DECK_COUNTS
+        game.opponent_hand_deck_size = sum(HAND_DECK_COUNTS)
+        game.player_hand.clear()
+        game.opponent_hand.clear()
+        game.draw_hand()
+
+    return op
+
+
+def opponent_positions(seed: int, count: int = 1000) -> list:
+    """Collect snapshots of positions where the opponent is about to take its turn."""
+    game: Game = Game(random.Random(seed))
+    positions: list = []
+    while len(positions) < count:
+        game.reset_game()
+        while not game.round_ended:
+            if game.player_passed:
+                if not game.opponent_passed:
+                    positions.append(game.snapshot())
+                game.step(END_TURN)
+                continue
+            action: int = basic_player_policy(game)
+            if action == END_TURN and not game.opponent_passed:
+                positions.append(game.snapshot())
+            game.step(action)
+    return positions[:count]
+
+
+def bench_opponent_turn(seed: int) -> Callable[[], None]:
+    """Restore a recorded position and run one opponent turn from it (the restore is included)."""
+    game: Game = Game(random.Random(seed))
+    positions: list = opponent_positions(seed)
+    index: list[int] = [0]
+
+    def op() -> None:
+        game.restore(positions[index[0] % len(positions)])
+        index[0] += 1
+        game.opponent_turn()
+
+    return op
+
+
+def bench_round(seed: int) -> Callable[[], None]:
+    """Play one round from reset_round to resolution with the basic player policy."""
+    game: Game = Game(random.Random(seed))
+    game.reset_game()
+
+    def op() -> None:
+        if game.winner != NO_RESULT:
+            game.reset_game()
+        else:
+            game.reset_round()
+        game.play_round(basic_player_policy)
+
+    return op
+
+
+def bench_match(seed: int) -> Callable[[], None]:
+    """Play one full first-to-three-rounds match with the basic player policy."""
+    game: Game = Game(random.Random(seed))
+
+    def op() -> None:
+        game.play_match(basic_player_policy)
+
+    return op
+
+
+class StubWidget:
+    """Minimal stand-in for a Tk widget, used when no display is available."""
+
+    def __init__(self) -> None:
+        """Start with no options set."""
+        self.options: dict = {}
+
+    def config(self, **options: object) -> None:
+        """Record the options instead of drawing them."""
+        self.options.update(options)
+
+
+def stub_ui(game: Game):
+    """Build a PazaakUI whose widgets are stubs, without creating a Tk window."""
+    from pazaakui import PazaakUI
+
+    ui = PazaakUI.__new__(PazaakUI)
+    ui.game = game
+    ui.shown_text = {}
+    ui.score_label = StubWidget()
+    ui.score_label_opponent = StubWidget()
+    ui.dot_labels = [StubWidget() for _ in range(3)]
+    ui.dot_labels_opponent = [StubWidget() for _ in range(3)]
+    ui.card_labels = [StubWidget() for _ in range(9)]
+    ui.card_labels_opponent = [StubWidget() for _ in range(9)]
+    ui.hand_card_buttons = [StubWidget() for _ in range(4)]
+    ui.opponent_hand_labels = [StubWidget() for _ in range(4)]
+    return ui
+
+
+def display_ui(game: Game):
+    """Build a real PazaakUI on the available display, skipping the rules dialog, the main loop and the estimate."""
+    import tkinter
+    import pazaakui
+
+    ask, loop = pazaakui.messagebox.askokcancel, tkinter.Tk.mainloop
+    pazaakui.messagebox.askokcancel = lambda **kwargs: False
+    tkinter.Tk.mainloop = lambda self, n=0: None
+    try:
+        ui = pazaakui.PazaakUI()
+    finally:
+        pazaakui.messagebox.askokcancel, tkinter.Tk.mainloop = ask, loop
+    # The window asks its background estimator about the opening position; stop it so the sampling
+    # thread does not compete for the GIL while update_ui is timed, as in the headless stub_ui case.
+    ui.estimator.cancel()
+    ui.game = game
+    return ui
+
+
+def bench_update_ui(seed: int) -> Callable[[], None]:
+    """Refresh the whole UI after moving to another recorded position, so some cells change every time."""
+    game: Game = Game(random.Random(seed))
+    positions: list = opponent_positions(seed, 200)
+    ui = display_ui(game) if os.environ.get("DISPLAY") else stub_ui(game)
+    index: list[int] = [0]
+
+    def op() -> None:
+        game.restore(positions[index[0] % len(positions)])
+        index[0] += 1
+        ui.update_ui()
+
+    return op
+
+
+# Each case: (setup function, measured operations, warmup operations).
+CASES: dict[str, tuple[Callable[[int], Callable[[], None]], int, int]] = {
+    "draw_card": (bench_draw_card, 200_000, 10_000),
+    "draw_hand": (bench_draw_hand, 50_000, 2_000),
+    "opponent_turn": (bench_opponent_turn, 100_000, 5_000),
+    "round": (bench_round, 20_000, 1_000),
+    "match": (bench_match, 5_000, 200),
+    "update_ui": (bench_update_ui, 20_000, 1_000),
+}
+
+
+def run_case(name: str, scale: float = 1.0) -> dict:
+    """Run one benchmark case with its fixed seed and return throughput and latency percentiles."""
+    setup, operations, warmup = CASES[name]
+    op: Callable[[], None] = setup(SEED)
+    for _ in range(warmup):
+        op()
+    operations = max(1, int(operations * scale))
+    timings: list[int] = [0] * operations
+    clock = time.perf_counter_ns
+    started: int = clock()
+    for i in range(operations):
+        before: int = clock()
+        op()
+        timings[i] = clock() - before
+    elapsed: int = clock() - started
+    timings.sort()
+    return {
+        "operations": operations,
+        "ops_per_sec": operations / (elapsed / 1e9),
+        "p50_us": percentile(timings, 0.50) / 1000,
+        "p90_us": percentile(timings, 0.90) / 1000,
+        "p99_us": percentile(timings, 0.99) / 1000,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """List the cases whose throughput dropped or median latency grew by more than threshold."""
+    regressions: list[str] = []
+    for name, current in results["results"].items():
+        previous: dict | None = baseline["results"].get(name)
+        if previous is None:
+            continue
+        if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {current['ops_per_sec']:,.0f}/s vs baseline {previous['ops_per_sec']:,.0f}/s"
+            )
+        if current["p50_us"] > previous["p50_us"] * (1 + threshold):
+            regressions.append(f"{name}: p50 {current['p50_us']:.2f}us vs baseline {previous['p50_us']:.2f}us")
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmark suite, write the results as JSON and optionally compare them to a baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark the Pazaak engine and UI refresh.")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="baseline JSON file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated case names")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the operation counts")
+    args = parser.parse_args()
+    results: dict = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": SEED,
+            "scale": args.scale,
+        },
+        "results": {},
+    }
+    for name in args.cases.split(","):
+        results["results"][name] = result = run_case(name, args.scale)
+        print(
+            f"{name:>14}: {result['ops_per_sec']:>12,.0f} ops/s  p50 {result['p50_us']:8.2f}us  "
+            f"p90 {result['p90_us']:8.2f}us  p99 {result['p99_us']:8.2f}us"
+        )
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            regressions: list[str] = compare(results, json.load(file), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+import argparse
+import os
+import random
+import struct
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game import Game, END_TURN, STAND, INVERT_CARD, HAND_DECK_COUNTS
+from solver import PLAY_POSITIVE, PLAY_NEGATIVE, DRAW_ODDS, state_key, resolve, to_engine_action
+
+# Actions use the solver's encoding: END_TURN, STAND, then a hand card value played with either sign.
+ACTIONS: int = PLAY_NEGATIVE + 10
+PLAYER_SEAT: int = 0
+OPPONENT_SEAT: int = 1
+DRAW_CARDS: tuple[int, ...] = tuple(card for card, _ in DRAW_ODDS)
+HAND_DECK: tuple[int, ...] = tuple(value for idx, count in enumerate(HAND_DECK_COUNTS) for value in [idx + 1] * count)
+
+STRATEGY_MAGIC: bytes = b"PZKC"
+STRATEGY_VERSION: int = 1
+STRATEGY_HEADER: struct.Struct = struct.Struct("<4sIQ")
+
+
+def infoset_key(
+    seat: int,
+    own_total: int,
+    other_total: int,
+    own_hand: tuple[int, ...],
+    other_cards: int,
+    other_passed: bool,
+    card_played: bool,
+) -> int:
+    """Pack what the seat to move knows at a decision point into a 64-bit infoset key.
+
+    The other seat's hand is hidden, so only its number of cards is part of the key.
+    """
+    return state_key(own_total, other_total, own_hand, (), other_passed, card_played) | other_cards << 28 | seat << 44
+
+
+def legal_actions(total: int, hand: tuple[int, ...], card_played: bool) -> list[int]:
+    """List the actions at a decision point, leaving out hand card plays that go over 20.
+
+    Ending the turn is only possible under 20 (at 20 the engine passes automatically, and over 20 it
+    loses like a stand), and at most one hand card can be played per turn.
+    """
+    actions: list[int] = [END_TURN, STAND] if total < 20 else [STAND]
+    if not card_played:
+        for idx, card in enumerate(hand):
+            if idx and card == hand[idx - 1]:
+                continue
+            if total + card <= 20:
+                actions.append(PLAY_POSITIVE + card - 1)
+            if total - card <= 20:
+                actions.append(PLAY_NEGATIVE + card - 1)
+    return actions
+
+
+def regret_matching(regrets: list[float], actions: list[int]) -> list[float]:
+    """Return the current strategy over the legal actions, proportional to their positive regrets."""
+    positive: list[float] = [max(regrets[action], 0.0) for action in actions]
+    total: float = sum(positive)
+    if total <= 0.0:
+        return [1.0 / len(actions)] * len(actions)
+    return [value / total for value in positive]
+
+
+class Traversal:
+    """External-sampling Monte Carlo CFR over the abstracted round, accumulating regret and strategy updates.
+
+    The round state is both totals, both hands as sorted multisets and the pass flags; draws follow
+    the solver's DRAW_ODDS. Each seat decides knowing its own hand but only the size of the other's.
+    Updates start from a read-only snapshot of the shared regrets and are kept locally, so any
+    number of traversals can run in parallel and be merged afterwards.
+    """
+
+    def __init__(self, keys: np.ndarray, regrets: np.ndarray, rng: random.Random) -> None:
+        """Start from the shared regrets, indexed by the sorted infoset keys."""
+        self.keys: np.ndarray = keys
+        self.shared: np.ndarray = regrets
+        self.rng: random.Random = rng
+        self.regrets: dict[int, list[float]] = {}
+        self.regret_deltas: dict[int, list[float]] = {}
+        self.strategy_deltas: dict[int, list[float]] = {}
+
+    def current_regrets(self, key: int) -> list[float]:
+        """Return the regrets of an infoset: the shared values plus this traversal's updates."""
+        regrets: list[float] | None = self.regrets.get(key)
+        if regrets is None:
+            row: int = int(np.searchsorted(self.keys, key))
+            if row < len(self.keys) and self.keys[row] == key:
+                regrets = self.shared[row].tolist()
+            else:
+                regrets = [0.0] * ACTIONS
+            self.regrets[key] = regrets
+        return regrets
+
+    def iterate(self, hand_size: int) -> None:
+        """Deal a random round start and traverse it once for each seat.
+
+        Hands are used up over a match, so each seat gets between zero and hand_size cards.
+        """
+        for traverser in (PLAYER_SEAT, OPPONENT_SEAT):
+            player_size: int = self.rng.randint(0, hand_size)
+            hands: list[int] = self.rng.sample(HAND_DECK, player_size + self.rng.randint(0, hand_size))
+            player_hand: tuple[int, ...] = tuple(sorted(hands[:player_size]))
+            opponent_hand: tuple[int, ...] = tuple(sorted(hands[player_size:]))
+            self.draw(PLAYER_SEAT, 0, 0, player_hand, opponent_hand, False, traverser)
+
+    def draw(
+        self,
+        seat: int,
+        own_total: int,
+        other_total: int,
+        own_hand: tuple[int, ...],
+        other_hand: tuple[int, ...],
+        other_passed: bool,
+        traverser: int,
+    ) -> float:
+        """Sample the card that starts a seat's turn and return the traverser's value from there."""
+        own_total += self.rng.choice(DRAW_CARDS)
+        if own_total == 20:
+            return self.stand(seat, own_total, other_total, own_hand, other_hand, other_passed, traverser)
+        return self.decide(seat, own_total, other_total, own_hand, other_hand, other_passed, False, traverser)
+
+    def stand(
+        self,
+        seat: int,
+        own_total: int,
+        other_total: int,
+        own_hand: tuple[int, ...],
+        other_hand: tuple[int, ...],
+        other_passed: bool,
+        traverser: int,
+    ) -> float:
+        """Pass for the seat to move: the round ends, or the other seat plays on alone."""
+        if own_total > 20 or other_passed:
+            return self.terminal(seat, own_total, other_total, traverser)
+        return self.draw(1 - seat, other_total, own_total, other_hand, own_hand, True, traverser)
+
+    def end_turn(
+        self,
+        seat: int,
+        own_total: int,
+        other_total: int,
+        own_hand: tuple[int, ...],
+        other_hand: tuple[int, ...],
+        other_passed: bool,
+        traverser: int,
+    ) -> float:
+        """End the turn of the seat to move: the other seat draws, or this one again if the other passed."""
+        if other_passed:
+            return self.draw(seat, own_total, other_total, own_hand, other_hand, True, traverser)
+        return self.draw(1 - seat, other_total, own_total, other_hand, own_hand, False, traverser)
+
+    @staticmethod
+    def terminal(seat: int, own_total: int, other_total: int, traverser: int) -> float:
+        """Return the traverser's round value at the end of the round."""
+        if seat == PLAYER_SEAT:
+            value: float = resolve(own_total, other_total)
+        else:
+            value = resolve(other_total, own_total)
+        return value if traverser == PLAYER_SEAT else -value
+
+    def decide(
+        self,
+        seat: int,
+        own_total: int,
+        other_total: int,
+        own_hand: tuple[int, ...],
+        other_hand: tuple[int, ...],
+        other_passed: bool,
+        card_played: bool,
+        traverser: int,
+    ) -> float:
+        """Visit a decision point: try every action for the traverser, sample one for the other seat."""
+        key: int = infoset_key(seat, own_total, other_total, own_hand, len(other_hand), other_passed, card_played)
+        actions: list[int] = legal_actions(own_total, own_hand, card_played)
+        strategy: list[float] = regret_matching(self.current_regrets(key), actions)
+        state: tuple = (seat, own_total, other_total, own_hand, other_hand, other_passed)
+        if seat != traverser:
+            deltas: list[float] = self.strategy_deltas.setdefault(key, [0.0] * ACTIONS)
+            for action, probability in zip(actions, strategy):
+                deltas[action] += probability
+            action = self.rng.choices(actions, strategy)[0]
+            return self.act(state, action, traverser)
+        values: list[float] = [self.act(state, action, traverser) for action in actions]
+        expected: float = sum(probability * value for probability, value in zip(strategy, values))
+        regrets: list[float] = self.regrets[key]
+        deltas = self.regret_deltas.setdefault(key, [0.0] * ACTIONS)
+        for action, value in zip(actions, values):
+            regrets[action] += value - expected
+            deltas[action] += value - expected
+        return expected
+
+    def act(self, state: tuple, action: int, traverser: int) -> float:
+        """Apply one action at a decision point and return the traverser's value afterwards."""
+        seat, own_total, other_total, own_hand, other_hand, other_passed = state
+        if action == STAND:
+            return self.stand(seat, own_total, other_total, own_hand, other_hand, other_passed, traverser)
+        if action == END_TURN:
+            return self.end_turn(seat, own_total, other_total, own_hand, other_hand, other_passed, traverser)
+        if action < PLAY_NEGATIVE:
+            card, sign = action - PLAY_POSITIVE + 1, 1
+        else:
+            card, sign = action - PLAY_NEGATIVE + 1, -1
+        idx: int = own_hand.index(card)
+        rest: tuple[int, ...] = own_hand[:idx] + own_hand[idx + 1 :]
+        return self.decide(seat, own_total + sign * card, other_total, rest, other_hand, other_passed, True, traverser)
+
+
+def run_iterations(
+    snapshot: str, seed: int, batch: int, iterations: int, hand_size: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Run a batch of traversals against the shared regret snapshot and return the updates as arrays.
+
+    Returns (regret keys, regret deltas, strategy keys, strategy deltas); the batch is seeded by
+    (seed, batch), so a run depends only on its seed and batch layout.
+    """
+    keys: np.ndarray = np.load(snapshot + ".keys.npy", mmap_mode="r")
+    regrets: np.ndarray = np.load(snapshot + ".regrets.npy", mmap_mode="r")
+    traversal: Traversal = Traversal(keys, regrets, random.Random(f"cfr:{seed}:{batch}"))
+    for _ in range(iterations):
+        traversal.iterate(hand_size)
+    return (
+        np.fromiter(traversal.regret_deltas, dtype=np.uint64, count=len(traversal.regret_deltas)),
+        np.array(list(traversal.regret_deltas.values()), dtype=np.float32).reshape(-1, ACTIONS),
+        np.fromiter(traversal.strategy_deltas, dtype=np.uint64, count=len(traversal.strategy_deltas)),
+        np.array(list(traversal.strategy_deltas.values()), dtype=np.float32).reshape(-1, ACTIONS),
+    )
+
+
+class CFRSolver:
+    """Regret and average strategy tables for both seats, kept as NumPy arrays sorted by infoset key.
+
+    Iterations run in batches across a process pool: every batch reads the same regret snapshot,
+    and the updates of all batches are then merged in batch order. Regrets are floored at zero
+    after each merge (regret matching+), which speeds up convergence of the average strategy.
+    """
+
+    def __init__(self) -> None:
+        """Start with empty tables."""
+        self.keys: np.ndarray = np.zeros(0, dtype=np.uint64)
+        self.regrets: np.ndarray = np.zeros((0, ACTIONS), dtype=np.float32)
+        self.strategy_sums: np.ndarray = np.zeros((0, ACTIONS), dtype=np.float32)
+        self.iterations: int = 0
+        self.batches: int = 0
+
+    def rows(self, keys: np.ndarray) -> np.ndarray:
+        """Return the table rows of the given keys, adding rows for keys not seen yet."""
+        new_keys: np.ndarray = np.setdiff1d(keys, self.keys)
+        if len(new_keys):
+            merged: np.ndarray = np.union1d(self.keys, new_keys)
+            old_rows: np.ndarray = np.searchsorted(merged, self.keys)
+            regrets: np.ndarray = np.zeros((len(merged), ACTIONS), dtype=np.float32)
+            strategy_sums: np.ndarray = np.zeros((len(merged), ACTIONS), dtype=np.float32)
+            regrets[old_rows] = self.regrets
+            strategy_sums[old_rows] = self.strategy_sums
+            self.keys, self.regrets, self.strategy_sums = merged, regrets, strategy_sums
+        return np.searchsorted(self.keys, keys)
+
+    def merge(self, update: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]) -> None:
+        """Add one batch's regret and strategy updates to the tables."""
+        regret_keys, regret_deltas, strategy_keys, strategy_deltas = update
+        if len(regret_keys):
+            rows: np.ndarray = self.rows(regret_keys)
+            self.regrets[rows] += regret_deltas
+        if len(strategy_keys):
+            rows = self.rows(strategy_keys)
+            self.strategy_sums[rows] += strategy_deltas
+
+    def train(
+        self,
+        iterations: int,
+        seed: int = 0,
+        hand_size: int = 4,
+        batch_iterations: int = 200,
+        workers: int | None = None,
+        checkpoint: str | None = None,
+    ) -> None:
+        """Run iterations in parallel batches, saving a checkpoint after every round of batches."""
+        processes: int = workers or os.cpu_count() or 1
+        with tempfile.TemporaryDirectory() as directory, ProcessPoolExecutor(max_workers=workers) as executor:
+            snapshot: str = os.path.join(directory, "snapshot")
+            while self.iterations < iterations:
+                np.save(snapshot + ".keys.npy", self.keys)
+                np.save(snapshot + ".regrets.npy", self.regrets)
+                sizes: list[int] = []
+                remaining: int = iterations - self.iterations
+                while remaining > 0 and len(sizes) < processes:
+                    sizes.append(min(batch_iterations, remaining))
+                    remaining -= sizes[-1]
+                futures = [
+                    executor.submit(run_iterations, snapshot, seed, self.batches + idx, size, hand_size)
+                    for idx, size in enumerate(sizes)
+                ]
+                for future in futures:
+                    self.merge(future.result())
+                np.maximum(self.regrets, 0.0, out=self.regrets)
+                self.iterations += sum(sizes)
+                self.batches += len(sizes)
+                if checkpoint is not None:
+                    self.save_checkpoint(checkpoint)
+
+    def save_checkpoint(self, path: str) -> None:
+        """Write the tables and progress to a compressed NumPy archive, replacing it atomically."""
+        temporary: str = path + ".tmp.npz"
+        np.savez_compressed(
+            temporary,
+            keys=self.keys,
+            regrets=self.regrets,
+            strategy_sums=self.strategy_sums,
+            progress=np.array([self.iterations, self.batches], dtype=np.int64),
+        )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load_checkpoint(cls, path: str) -> "CFRSolver":
+        """Restore a solver from a checkpoint written by save_checkpoint."""
+        solver: CFRSolver = cls()
+        with np.load(path) as data:
+            solver.keys = data["keys"]
+            solver.regrets = data["regrets"]
+            solver.strategy_sums = data["strategy_sums"]
+            solver.iterations, solver.batches = (int(value) for value in data["progress"])
+        return solver
+
+    def average_strategy(self) -> np.ndarray:
+        """Return the normalized average strategy of every infoset."""
+        totals: np.ndarray = self.strategy_sums.sum(axis=1, keepdims=True)
+        return np.divide(self.strategy_sums, totals, out=np.zeros_like(self.strategy_sums), where=totals > 0)
+
+    def export(self, path: str) -> None:
+        """Write the average strategy of the visited infosets to a strategy file for CFRStrategy."""
+        visited: np.ndarray = self.strategy_sums.sum(axis=1) > 0
+        keys: np.ndarray = self.keys[visited]
+        with open(path, "wb") as file:
+            file.write(STRATEGY_HEADER.pack(STRATEGY_MAGIC, STRATEGY_VERSION, len(keys)))
+            file.write(keys.astype("<u8").tobytes())
+            file.write(self.average_strategy()[visited].astype("<f4").tobytes())
+
+
+class CFRStrategy:
+    """Memory-mapped strategy file; use as Game(opponent_policy=CFRStrategy(path)) or as a player policy.
+
+    Decisions are sampled from the stored average strategy. States missing from the file fall back
+    to the built-in opponent rules for the opponent seat and to standing at 17 for the player seat.
+    """
+
+    def __init__(self, path: str, rng: random.Random | None = None) -> None:
+        """Map the strategy file and validate its header."""
+        with open(path, "rb") as file:
+            magic, version, count = STRATEGY_HEADER.unpack(file.read(STRATEGY_HEADER.size))
+        if magic != STRATEGY_MAGIC or version != STRATEGY_VERSION:
+            raise ValueError(f"{path} is not a version {STRATEGY_VERSION} strategy file")
+        self.keys: np.ndarray = np.memmap(path, dtype="<u8", mode="r", offset=STRATEGY_HEADER.size, shape=(count,))
+        self.strategy: np.ndarray = np.memmap(
+            path, dtype="<f4", mode="r", offset=STRATEGY_HEADER.size + 8 * count, shape=(count, ACTIONS)
+        )
+        self.rng: random.Random = rng if rng is not None else random.Random()
+        self.pending: tuple[int, int] | None = None
+
+    def choose(self, key: int, total: int, hand: tuple[int, ...], card_played: bool) -> int | None:
+        """Sample an action for a decision point, or return None if the state is not in the file."""
+        row: int = int(np.searchsorted(self.keys, key))
+        if row >= len(self.keys) or self.keys[row] != key:
+            return None
+        actions: list[int] = legal_actions(total, hand, card_played)
+        weights: list[float] = [float(self.strategy[row, action]) for action in actions]
+        if sum(weights) <= 0.0:
+            return None
+        return self.rng.choices(actions, weights)[0]
+
+    def __call__(self, game: Game) -> None:
+        """Play the opponent's turn after its draw: at most one hand card, then pass or not."""
+        card_played: bool = False
+        while True:
+            hand: tuple[int, ...] = tuple(sorted(game.opponent_hand))
+            key: int = infoset_key(
+                OPPONENT_SEAT,
+                game.opponent_total,
+                game.player_total,
+                hand,
+                len(game.player_hand),
+                game.player_passed,
+                card_played,
+            )
+            action: int | None = self.choose(key, game.opponent_total, hand, card_played)
+            if action is None:
+                if not card_played:
+                    game.opponent_respond()
+                return
+            if action == STAND:
+                game.opponent_passed = True
+                return
+            if action == END_TURN:
+                return
+            sign: int = 1 if action < PLAY_NEGATIVE else -1
+            card: int = action - (PLAY_POSITIVE if sign > 0 else PLAY_NEGATIVE) + 1
+            game.opponent_hand.remove(card)
+            game.opponent_board.append(sign * card)
+            game.opponent_total += sign * card
+            card_played = True
+
+    def player_policy(self, game: Game) -> int:
+        """Return the player's next Game.step action, keeping a sampled choice while it takes two steps.
+
+        A choice is only kept across the invert step it starts, so every other decision is sampled anew.
+        """
+        if game.player_passed:
+            return END_TURN
+        hand: tuple[int, ...] = tuple(sorted(abs(card) for card in game.player_hand))
+        key: int = infoset_key(
+            PLAYER_SEAT,
+            game.player_total,
+            game.opponent_total,
+            hand,
+            len(game.opponent_hand),
+            game.opponent_passed,
+            game.hand_card_played,
+        )
+        pending: tuple[int, int] | None = self.pending
+        self.pending = None
+        if pending is not None and pending[0] == key:
+            action: int | None = pending[1]
+        else:
+            action = self.choose(key, game.player_total, hand, game.hand_card_played)
+            if action is None:
+                action = STAND if game.player_total >= 17 else END_TURN
+        engine_action: int = to_engine_action(game, action)
+        if engine_action >= INVERT_CARD:
+            self.pending = (key, action)
+        return engine_action
+
+
+def main() -> None:
+    """Train the CFR solver from the command line and export its average strategy."""
+    parser = argparse.ArgumentParser(description="Approximate a Nash equilibrium of a Pazaak round with CFR.")
+    parser.add_argument("output", help="path of the strategy file to write")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--hand-size", type=int, default=4, help="most hand cards each seat holds")
+    parser.add_argument("--batch", type=int, default=200, help="iterations per worker batch")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint file to resume from and save to")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    if args.checkpoint is not None and os.path.exists(args.checkpoint):
+        solver: CFRSolver = CFRSolver.load_checkpoint(args.checkpoint)
+    else:
+        solver = CFRSolver()
+    started: float = time.perf_counter()
+    solver.train(args.iterations, args.seed, args.hand_size, args.batch, args.workers, args.checkpoint)
+    solver.export(args.output)
+    print(f"{solver.iterations} iterations, {len(solver.keys)} infosets in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+from collections import deque
+from dataclasses import asdict
+
+from aggregate import OutcomeStats, aggregate_chunk
+from tournament import CHUNK_SIZE
+
+DEFAULT_PORT: int = 8766
+# Seconds between the coordinator's checks for finished runs and overdue shards.
+POLL_SECONDS: float = 0.05
+
+# Messages are JSON objects, one per line:
+#   worker -> coordinator   {"type": "ready"}, then {"type": "result", "shard": i, "stats": {...}}
+#   coordinator -> worker   {"type": "shard", "shard": i, "seed": s, "first_chunk": c, "chunks": n, "matches": m}
+#                           or {"type": "stop"} once every shard has a result
+
+
+def run_shard(seed: int, first_chunk: int, chunks: int, matches: int) -> OutcomeStats:
+    """Play one shard: a run of consecutive tournament chunks, each with its own seeded RNG stream."""
+    stats: OutcomeStats = OutcomeStats()
+    for index in range(first_chunk, first_chunk + chunks):
+        start: int = index * CHUNK_SIZE
+        stats.merge(aggregate_chunk(seed, index, min(CHUNK_SIZE, matches - start)))
+    return stats
+
+
+def run_worker(host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> None:
+    """Connect to a coordinator and play the shards it hands out until it says stop."""
+    with socket.create_connection((host, port)) as connection, connection.makefile("rw") as stream:
+        stream.write(json.dumps({"type": "ready"}) + "\n")
+        stream.flush()
+        for line in stream:
+            message: dict = json.loads(line)
+            if message["type"] != "shard":
+                return
+            stats: OutcomeStats = run_shard(
+                message["seed"], message["first_chunk"], message["chunks"], message["matches"]
+            )
+            stream.write(json.dumps({"type": "result", "shard": message["shard"], "stats": asdict(stats)}) + "\n")
+            stream.flush()
+
+
+class Coordinator:
+    """Splits a match budget into seeded shards, hands them to connected workers and collects the results.
+
+    A shard covers shard_chunks consecutive tournament chunks, so its matches depend only on the seed
+    and the chunk indices, never on which worker played it. A shard goes back in the queue when its
+    worker disconnects, and is handed out again after shard_timeout seconds without a result; the
+    first result to arrive for a shard is kept. The merge runs in shard order once all are in.
+    """
+
+    def __init__(self, matches: int, seed: int = 0, shard_chunks: int = 8, shard_timeout: float | None = None) -> None:
+        """Plan the shards of a run."""
+        self.matches: int = matches
+        self.seed: int = seed
+        self.shard_timeout: float | None = shard_timeout
+        chunk_count: int = (matches + CHUNK_SIZE - 1) // CHUNK_SIZE
+        self.shards: list[tuple[int, int]] = [
+            (first, min(shard_chunks, chunk_count - first)) for first in range(0, chunk_count, shard_chunks)
+        ]
+        self.queue: deque[int] = deque(range(len(self.shards)))
+        self.deadlines: dict[int, float] = {}
+        self.results: dict[int, OutcomeStats] = {}
+        self.reassigned: int = 0
+        self.handlers: set[asyncio.Task] = set()
+
+    @property
+    def finished(self) -> bool:
+        """Return whether every shard has a result."""
+        return len(self.results) == len(self.shards)
+
+    async def next_shard(self) -> int | None:
+        """Wait for a shard to hand out: a queued one, or an overdue one; None once the run is finished."""
+        while not self.finished:
+            while self.queue:
+                shard: int = self.queue.popleft()
+                if shard not in self.results:
+                    return shard
+            now: float = time.monotonic()
+            for shard, deadline in self.deadlines.items():
+                if deadline <= now and shard not in self.results:
+                    self.reassigned += 1
+                    return shard
+            await asyncio.sleep(POLL_SECONDS)
+        return None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Feed one worker shards until the run is finished or the worker disconnects."""
+        shard: int | None = None
+        self.handlers.add(asyncio.current_task())
+        try:
+            if not await reader.readline():
+                return
+            while (shard := await self.next_shard()) is not None:
+                first_chunk, chunks = self.shards[shard]
+                self.deadlines[shard] = time.monotonic() + self.shard_timeout if self.shard_timeout else float("inf")
+                message: dict = {
+                    "type": "shard",
+                    "shard": shard,
+                    "seed": self.seed,
+                    "first_chunk": first_chunk,
+                    "chunks": chunks,
+                    "matches": self.matches,
+                }
+                writer.write((json.dumps(message) + "\n").encode())
+                await writer.drain()
+                line: bytes = await reader.readline()
+                if not line:
+                    break
+                result: dict = json.loads(line)
+                self.results.setdefault(result["shard"], OutcomeStats(**result["stats"]))
+                self.deadlines.pop(shard, None)
+                shard = None
+            else:
+                writer.write((json.dumps({"type": "stop"}) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if shard is not None and shard not in self.results:
+                self.deadlines.pop(shard, None)
+                self.queue.appendleft(shard)
+                self.reassigned += 1
+            writer.close()
+
+    def merged(self) -> OutcomeStats:
+        """Merge the shard results in shard order."""
+        total: OutcomeStats = OutcomeStats()
+        for shard in range(len(self.shards)):
+            total.merge(self.results[shard])
+        return total
+
+    async def run(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, local_workers: int = 0) -> OutcomeStats:
+        """Serve shards until all are done, optionally starting local worker processes, and return the merge."""
+        server: asyncio.Server = await asyncio.start_server(self.handle, host, port)
+        port = server.sockets[0].getsockname()[1]
+        processes: list[multiprocessing.Process] = [
+            multiprocessing.Process(target=run_worker, args=(host, port), daemon=True) for _ in range(local_workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            while not self.finished:
+                await asyncio.sleep(POLL_SECONDS)
+            # Let idle workers receive their stop message before the loop shuts down.
+            handlers: list[asyncio.Task] = [task for task in self.handlers if not task.done()]
+            if handlers:
+                await asyncio.wait(handlers, timeout=1.0)
+        finally:
+            server.close()
+            for process in processes:
+                process.join(timeout=1.0)
+                if process.is_alive():
+                    process.terminate()
+        return self.merged()
+
+
+def run_cluster(
+    matches: int,
+    seed: int = 0,
+    workers: int = 4,
+    shard_chunks: int = 8,
+    shard_timeout: float | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> OutcomeStats:
+    """Run a sharded aggregate on local worker processes; the totals equal aggregate.run_aggregate's."""
+    return asyncio.run(Coordinator(matches, seed, shard_chunks, shard_timeout).run(host, port, workers))
+
+
+def main() -> None:
+    """Run a coordinator or a worker from the command line."""
+    parser = argparse.ArgumentParser(description="Shard headless Pazaak simulations across worker processes or hosts.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    coordinate = commands.add_parser("coordinate", help="split a match budget into shards and merge the results")
+    coordinate.add_argument("--matches", type=int, default=1_000_000)
+    coordinate.add_argument("--seed", type=int, default=0)
+    coordinate.add_argument("--local-workers", type=int, default=0, help="worker processes to start on this host")
+    coordinate.add_argument("--shard-chunks", type=int, default=8, help=f"chunks of {CHUNK_SIZE} matches per shard")
+    coordinate.add_argument(
+        "--shard-timeout", type=float, default=None, help="seconds before an unfinished shard is handed out again"
+    )
+    worker = commands.add_parser("worker", help="play shards for a coordinator")
+    for command in (coordinate, worker):
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    if args.command == "worker":
+        run_worker(args.host, args.port)
+        return
+    coordinator: Coordinator = Coordinator(args.matches, args.seed, args.shard_chunks, args.shard_timeout)
+    started: float = time.perf_counter()
+    stats: OutcomeStats = asyncio.run(coordinator.run(args.host, args.port, args.local_workers))
+    elapsed: float = time.perf_counter() - started
+    print(stats.summary())
+    print(
+        f"{len(coordinator.shards)} shards, {coordinator.reassigned} reassigned, "
+        f"{args.matches / elapsed:,.0f} matches/s in {elapsed:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
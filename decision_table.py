@@ -0,0 +1,128 @@
+import argparse
+import random
+import time
+
+from game import Game, basic_player_policy
+
+# A decision: the opponent's total, hand and the cards it put on the board after responding, and its pass flag.
+Decision = tuple[int, tuple[int, ...], tuple[int, ...], bool]
+
+
+class OpponentTable:
+    """The built-in opponent rules compiled into a lookup table; use as Game(opponent_policy=OpponentTable()).
+
+    Game.opponent_respond only reads the opponent total, the player total, player_passed and the
+    opponent hand in order (its scans pick the first card that fits, so order matters). Each such
+    state is evaluated once with the reference rules on a scratch game and every later turn from it
+    is a single dict lookup. The table is cleared if it ever grows past max_entries. With validate
+    set, every turn is also replayed with the reference rules on a copy of the full game state and a
+    ValueError is raised on any difference.
+    """
+
+    def __init__(self, max_entries: int = 1_000_000, validate: bool = False) -> None:
+        """Create an empty table and the scratch game used to evaluate the reference rules."""
+        self.decisions: dict[tuple, Decision] = {}
+        self.max_entries: int = max_entries
+        self.validate: bool = validate
+        self.scratch: Game = Game()
+        self.misses: int = 0
+
+    def __call__(self, game: Game) -> None:
+        """Apply the opponent's response for the game's current state."""
+        decision: Decision = self.lookup(
+            game.opponent_total, game.player_total, game.player_passed, tuple(game.opponent_hand)
+        )
+        if self.validate:
+            self.check(game, decision)
+        game.opponent_total, hand, played, passed = decision
+        if played:
+            game.opponent_hand[:] = hand
+            game.opponent_board.extend(played)
+        if passed:
+            game.opponent_passed = True
+
+    def lookup(
+        self, opponent_total: int, player_total: int, player_passed: bool, opponent_hand: tuple[int, ...]
+    ) -> Decision:
+        """Return the opponent's decision for a state, compiling it on first use.
+
+        The rules only compare the player total with sums of at least 17 unless the player has
+        passed, and never with sums over 20, so player totals are folded into 17..21 where that
+        gives the same decision.
+        """
+        if player_total > 20:
+            player_total = 21
+        elif player_total < 17 and not player_passed:
+            player_total = 17
+        key: tuple = (opponent_total, player_total, player_passed, opponent_hand)
+        decision: Decision | None = self.decisions.get(key)
+        if decision is None:
+            decision = self.compile(key)
+        return decision
+
+    def compile(self, key: tuple) -> Decision:
+        """Evaluate the reference rules for one state and store the decision."""
+        if len(self.decisions) >= self.max_entries:
+            self.decisions.clear()
+        self.misses += 1
+        scratch: Game = self.scratch
+        scratch.opponent_total, scratch.player_total, scratch.player_passed, hand = key
+        scratch.opponent_passed = False
+        scratch.opponent_hand[:] = hand
+        scratch.opponent_board.clear()
+        scratch.opponent_respond()
+        decision: Decision = (
+            scratch.opponent_total,
+            tuple(scratch.opponent_hand),
+            tuple(scratch.opponent_board),
+            scratch.opponent_passed,
+        )
+        self.decisions[key] = decision
+        return decision
+
+    def check(self, game: Game, decision: Decision) -> None:
+        """Raise ValueError unless the reference rules give the same result as decision on the full game state."""
+        reference: Game = self.scratch
+        reference.restore(game.snapshot())
+        played_from: int = len(reference.opponent_board)
+        reference.opponent_respond()
+        expected: Decision = (
+            reference.opponent_total,
+            tuple(reference.opponent_hand),
+            tuple(reference.opponent_board[played_from:]),
+            reference.opponent_passed,
+        )
+        total, hand, played, passed = decision
+        actual: Decision = (total, hand, played, passed or game.opponent_passed)
+        if actual != expected:
+            raise ValueError(f"opponent table diverged from the reference rules: {actual} != {expected}")
+
+
+def compare_speed(matches: int, seed: int, validate: bool) -> None:
+    """Play the same matches with the reference rules and with the table, checking the results agree."""
+    timings: list[float] = []
+    winners: list[list[int]] = []
+    table: OpponentTable = OpponentTable(validate=validate)
+    for policy in (None, table):
+        game: Game = Game(random.Random(seed), policy)
+        started: float = time.perf_counter()
+        winners.append([game.play_match(basic_player_policy) for _ in range(matches)])
+        timings.append(time.perf_counter() - started)
+    if winners[0] != winners[1]:
+        raise ValueError("matches played with the table differ from the reference rules")
+    print(f"reference: {matches / timings[0]:,.0f} matches/s")
+    print(f"table:     {matches / timings[1]:,.0f} matches/s ({len(table.decisions)} states, {table.misses} misses)")
+
+
+def main() -> None:
+    """Compare the table against the reference rules from the command line."""
+    parser = argparse.ArgumentParser(description="Check and time the compiled opponent decision table.")
+    parser.add_argument("--matches", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--validate", action="store_true", help="check every turn against the reference rules")
+    args = parser.parse_args()
+    compare_speed(args.matches, args.seed, args.validate)
+
+
+if __name__ == "__main__":
+    main()
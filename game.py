@@ -1,59 +1,210 @@
 import random
-from tkinter import messagebox
-import time
+from typing import Callable, NamedTuple
+
+# Round and match results returned by Game.step, Game.resolve_round and Game.check_winner.
+NO_RESULT: int = 0
+PLAYER: int = 1
+OPPONENT: int = 2
+TIE: int = 3
+
+# Player actions accepted by Game.step. Hand card actions are offset by the hand index (0-3).
+END_TURN: int = 0
+STAND: int = 1
+PLAY_CARD: int = 2
+INVERT_CARD: int = 6
+ACTION_COUNT: int = 10
+
+# Events passed to Game.recorder as (event, value) pairs; matchlog.py stores and replays them.
+EVENT_MATCH_START: int = 0
+EVENT_ROUND_START: int = 1
+EVENT_PLAYER_DRAW: int = 2
+EVENT_OPPONENT_DRAW: int = 3
+EVENT_PLAYER_DEAL: int = 4
+EVENT_OPPONENT_DEAL: int = 5
+EVENT_ACTION: int = 6
+EVENT_OPPONENT_PLAY: int = 7
+EVENT_OPPONENT_PASS: int = 8
+EVENT_ROUND_END: int = 9
+EVENT_MATCH_END: int = 10
+
+# Decks are stored as card counts: bucket i holds the number of cards with value i + 1.
+MAIN_DECK_COUNTS: tuple[int, ...] = (2, 2, 2, 2, 2, 2, 2, 2, 2, 2)
+HAND_DECK_COUNTS: tuple[int, ...] = (2, 2, 2, 2, 2, 2, 0, 0, 0, 0)
+
+
+def draw_from_counts(rng: random.Random, counts: list[int], size: int) -> int:
+    """Remove a uniformly random card from a count array holding size cards and return its value."""
+    r: int = rng.randrange(size)
+    for idx in range(10):
+        count: int = counts[idx]
+        if r < count:
+            counts[idx] = count - 1
+            return idx + 1
+        r -= count
+    raise ValueError("deck size does not match its counts")
+
+
+class Snapshot(NamedTuple):
+    """Immutable, hashable copy of a game's state, produced by Game.snapshot and applied by Game.restore."""
+
+    deck: tuple[int, ...]
+    deck_size: int
+    player_hand_deck: tuple[int, ...]
+    player_hand_deck_size: int
+    opponent_hand_deck: tuple[int, ...]
+    opponent_hand_deck_size: int
+    player_hand: tuple[int, ...]
+    opponent_hand: tuple[int, ...]
+    player_board: tuple[int, ...]
+    opponent_board: tuple[int, ...]
+    player_total: int
+    opponent_total: int
+    player_rounds_won: int
+    opponent_rounds_won: int
+    player_passed: bool
+    opponent_passed: bool
+    hand_card_played: bool
+    round_ended: bool
+    round_result: int
+    winner: int
+
+
+# Zobrist keys are drawn from a fixed seed so position hashes are stable across runs and processes.
+_zobrist_rng: random.Random = random.Random(0x9A2AAC)
+TOTAL_OFFSET: int = 48
+ZOBRIST_DECK: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_zobrist_rng.getrandbits(64) for _ in range(max(MAIN_DECK_COUNTS) + 1)) for _ in range(10)
+)
+ZOBRIST_TOTALS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_zobrist_rng.getrandbits(64) for _ in range(2 * TOTAL_OFFSET)) for _ in range(2)
+)
+ZOBRIST_HANDS: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(tuple(_zobrist_rng.getrandbits(64) for _ in range(21)) for _ in range(4)) for _ in range(2)
+)
+ZOBRIST_ROUNDS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_zobrist_rng.getrandbits(64) for _ in range(4)) for _ in range(2)
+)
+ZOBRIST_PLAYER_PASSED: int = _zobrist_rng.getrandbits(64)
+ZOBRIST_OPPONENT_PASSED: int = _zobrist_rng.getrandbits(64)
+ZOBRIST_HAND_CARD_PLAYED: int = _zobrist_rng.getrandbits(64)
 
 
 class Game:
-    def __init__(self) -> None:
-        """Initialize the game by setting up decks, hands, boards, and game state variables."""
-        self.deck: list[int] = [1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 8, 8, 9, 9, 10, 10]
-        self.player_hand_deck: list[int] = [1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6]
-        self.opponent_hand_deck: list[int] = [1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6]
+    __slots__ = (
+        "rng",
+        "opponent_policy",
+        "recorder",
+        "player_hand_deck_counts",
+        "opponent_hand_deck_counts",
+        "deck",
+        "deck_size",
+        "player_hand_deck",
+        "player_hand_deck_size",
+        "opponent_hand_deck",
+        "opponent_hand_deck_size",
+        "player_hand",
+        "opponent_hand",
+        "player_board",
+        "opponent_board",
+        "player_total",
+        "opponent_total",
+        "player_rounds_won",
+        "opponent_rounds_won",
+        "previous_player_rounds_won",
+        "previous_opponent_rounds_won",
+        "player_passed",
+        "opponent_passed",
+        "hand_card_played",
+        "round_ended",
+        "round_result",
+        "winner",
+        "history",
+    )
+
+    def __init__(
+        self,
+        rng: random.Random | None = None,
+        opponent_policy: Callable[["Game"], None] | None = None,
+        recorder: Callable[[int, int], None] | None = None,
+        player_hand_deck_counts: tuple[int, ...] = HAND_DECK_COUNTS,
+        opponent_hand_deck_counts: tuple[int, ...] = HAND_DECK_COUNTS,
+    ) -> None:
+        """Initialize the game by setting up decks, hands, boards, and game state variables.
+
+        opponent_policy, if given, replaces the built-in opponent_respond rules: it is called after the
+        opponent draws its card and may play hand cards and set opponent_passed. recorder, if given,
+        receives every match event as an (EVENT_*, value) pair. The hand deck counts give each side's
+        side deck composition as the number of copies of each card value 1-10.
+        """
+        self.rng: random.Random = rng if rng is not None else random.Random()
+        self.opponent_policy: Callable[["Game"], None] | None = opponent_policy
+        self.recorder: Callable[[int, int], None] | None = recorder
+        self.player_hand_deck_counts: tuple[int, ...] = tuple(player_hand_deck_counts)
+        self.opponent_hand_deck_counts: tuple[int, ...] = tuple(opponent_hand_deck_counts)
+        self.deck: list[int] = list(MAIN_DECK_COUNTS)
+        self.deck_size: int = sum(MAIN_DECK_COUNTS)
+        self.player_hand_deck: list[int] = list(self.player_hand_deck_counts)
+        self.player_hand_deck_size: int = sum(self.player_hand_deck_counts)
+        self.opponent_hand_deck: list[int] = list(self.opponent_hand_deck_counts)
+        self.opponent_hand_deck_size: int = sum(self.opponent_hand_deck_counts)
         self.player_hand: list[int] = []
         self.opponent_hand: list[int] = []
         self.player_board: list[int] = []
         self.opponent_board: list[int] = []
+        self.player_total: int = 0
+        self.opponent_total: int = 0
         self.player_rounds_won: int = 0
         self.opponent_rounds_won: int = 0
         self.previous_player_rounds_won: int = 0
         self.previous_opponent_rounds_won: int = 0
         self.player_passed: bool = False
         self.opponent_passed: bool = False
+        self.hand_card_played: bool = False
         self.round_ended: bool = False
+        self.round_result: int = NO_RESULT
+        self.winner: int = NO_RESULT
+        self.history: list[Snapshot] = []
 
     def start(self) -> None:
         """Start the game by drawing the first card for the player's board."""
         card: int = self.draw_card()
         if card is not None:
             self.player_board.append(card)
+            self.player_total += card
+            if self.recorder is not None:
+                self.recorder(EVENT_PLAYER_DRAW, card)
 
     def draw_card(self) -> int:
         """Draw a random card from the main deck and return it."""
-        try:
-            card: int = random.choice(self.deck)
-            self.deck.remove(card)
-            return card
-        except IndexError:
+        if not self.deck_size:
             return None
+        card: int = draw_from_counts(self.rng, self.deck, self.deck_size)
+        self.deck_size -= 1
+        return card
 
     def draw_hand(self) -> None:
         """Draw 4 random cards for both the player's and opponent's hands from their respective hand decks."""
         for _ in range(4):
-            if self.player_hand_deck:
-                card: int = random.choice(self.player_hand_deck)
-                self.player_hand_deck.remove(card)
+            if self.player_hand_deck_size:
+                card: int = draw_from_counts(self.rng, self.player_hand_deck, self.player_hand_deck_size)
                 self.player_hand.append(card)
+                if self.recorder is not None:
+                    self.recorder(EVENT_PLAYER_DEAL, card)
+                self.player_hand_deck_size -= 1
         for _ in range(4):
-            if self.opponent_hand_deck:
-                card: int = random.choice(self.opponent_hand_deck)
-                self.opponent_hand_deck.remove(card)
+            if self.opponent_hand_deck_size:
+                card: int = draw_from_counts(self.rng, self.opponent_hand_deck, self.opponent_hand_deck_size)
                 self.opponent_hand.append(card)
+                if self.recorder is not None:
+                    self.recorder(EVENT_OPPONENT_DEAL, card)
+                self.opponent_hand_deck_size -= 1
 
     def player_play_hand_card(self, index: int) -> bool:
         """Play a hand card from the player's hand onto the player's board."""
         if 0 <= index < len(self.player_hand):
             card: int = self.player_hand.pop(index)
             self.player_board.append(card)
+            self.player_total += card
             return True
         return False
 
@@ -61,8 +212,8 @@ class Game:
         self, to_reduce: bool = False, to_reach_17: bool = False, to_improve_score: bool = False
     ) -> bool:
         """Opponent plays a hand card based on specified strategy flags."""
-        current_sum: int = sum(self.opponent_board)
-        player_sum: int = sum(self.player_board)
+        current_sum: int = self.opponent_total
+        player_sum: int = self.player_total
         if to_reduce:
             for idx, card in enumerate(self.opponent_hand):
                 inverted_card: int = -card
@@ -70,6 +221,7 @@ class Game:
                 if new_sum <= 20:
                     self.opponent_hand.pop(idx)
                     self.opponent_board.append(inverted_card)
+                    self.opponent_total = new_sum
                     return True
             return False
         elif to_reach_17:
@@ -78,6 +230,7 @@ class Game:
                 if 17 <= new_sum <= 20 and new_sum >= player_sum:
                     self.opponent_hand.pop(idx)
                     self.opponent_board.append(card)
+                    self.opponent_total = new_sum
                     return True
         elif to_improve_score:
             for idx, card in enumerate(self.opponent_hand):
@@ -85,6 +238,7 @@ class Game:
                 if current_sum < new_sum <= 20 and new_sum >= player_sum:
                     self.opponent_hand.pop(idx)
                     self.opponent_board.append(card)
+                    self.opponent_total = new_sum
                     return True
         return False
 
@@ -99,6 +253,9 @@ class Game:
             card: int = self.draw_card()
             if card is not None:
                 self.player_board.append(card)
+                self.player_total += card
+                if self.recorder is not None:
+                    self.recorder(EVENT_PLAYER_DRAW, card)
 
     def opponent_turn(self) -> None:
         """Perform opponent's turn based on game logic and strategies."""
@@ -107,13 +264,33 @@ class Game:
         drawn_card: int = self.draw_card()
         if drawn_card is not None:
             self.opponent_board.append(drawn_card)
-        opponent_sum: int = sum(self.opponent_board)
-        player_sum: int = sum(self.player_board)
+            self.opponent_total += drawn_card
+        if self.recorder is None:
+            if self.opponent_policy is not None:
+                self.opponent_policy(self)
+            else:
+                self.opponent_respond()
+            return
+        if drawn_card is not None:
+            self.recorder(EVENT_OPPONENT_DRAW, drawn_card)
+        played_from: int = len(self.opponent_board)
+        if self.opponent_policy is not None:
+            self.opponent_policy(self)
+        else:
+            self.opponent_respond()
+        for card in self.opponent_board[played_from:]:
+            self.recorder(EVENT_OPPONENT_PLAY, card)
+        if self.opponent_passed:
+            self.recorder(EVENT_OPPONENT_PASS, 1)
+
+    def opponent_respond(self) -> None:
+        """Decide the opponent's hand card plays and whether to pass, after its card for the turn is drawn."""
+        opponent_sum: int = self.opponent_total
+        player_sum: int = self.player_total
         if opponent_sum > 20:
             used_card: bool = self.opponent_play_hand_card(to_reduce=True)
-            opponent_sum = sum(self.opponent_board)
+            opponent_sum = self.opponent_total
             if used_card and 17 <= opponent_sum <= 20 and opponent_sum >= player_sum:
-                time.sleep(1)
                 self.opponent_passed = True
             return
         if self.player_passed and opponent_sum >= player_sum and opponent_sum <= 20:
@@ -125,14 +302,13 @@ class Game:
                 return
             else:
                 used_card: bool = self.opponent_play_hand_card(to_improve_score=True)
-                opponent_sum = sum(self.opponent_board)
+                opponent_sum = self.opponent_total
                 if used_card:
-                    time.sleep(1)
                     if opponent_sum >= player_sum and opponent_sum <= 20:
                         self.opponent_passed = True
                     elif opponent_sum > 20:
                         used_card = self.opponent_play_hand_card(to_reduce=True)
-                        opponent_sum = sum(self.opponent_board)
+                        opponent_sum = self.opponent_total
                         if opponent_sum <= 20 and opponent_sum >= player_sum:
                             self.opponent_passed = True
                         else:
@@ -144,46 +320,263 @@ class Game:
                 return
         if opponent_sum < 17:
             used_card: bool = self.opponent_play_hand_card(to_reach_17=True)
-            opponent_sum = sum(self.opponent_board)
+            opponent_sum = self.opponent_total
             if used_card and 17 <= opponent_sum <= 20 and opponent_sum >= player_sum:
                 self.opponent_passed = True
 
-    def check_winner(self) -> None:
-        """Check if either player has won the game and reset if so."""
-        if self.player_rounds_won == 3 and self.opponent_rounds_won == 3:
-            self.player_rounds_won = 0
-            self.opponent_rounds_won = 0
-            messagebox.showinfo(title="Draw", message="The game ended in a draw.")
-            self.reset_game()
-        elif self.player_rounds_won == 3:
-            self.player_rounds_won = 0
-            self.opponent_rounds_won = 0
-            messagebox.showinfo(title="Congratulations", message="You won the game.")
-            self.reset_game()
-        elif self.opponent_rounds_won == 3:
-            self.player_rounds_won = 0
-            self.opponent_rounds_won = 0
-            messagebox.showinfo(title="Defeat", message="You lost the game.")
-            self.reset_game()
+    def step(self, action: int) -> int:
+        """Apply a player action, advance the game and return the round result (NO_RESULT while it continues)."""
+        if self.round_ended:
+            return NO_RESULT
+        if action != END_TURN and self.recorder is not None:
+            self.recorder(EVENT_ACTION, action)
+        if action == END_TURN:
+            result: int = self.advance_opponent()
+            if result == NO_RESULT:
+                result = self.advance_player()
+            return result
+        if action == STAND:
+            self.player_passed = True
+            if self.player_total > 20 or self.opponent_passed:
+                return self.resolve_round()
+            return NO_RESULT
+        if PLAY_CARD <= action < INVERT_CARD:
+            if not self.player_passed and not self.hand_card_played:
+                self.hand_card_played = self.player_play_hand_card(action - PLAY_CARD)
+            return NO_RESULT
+        if INVERT_CARD <= action < ACTION_COUNT:
+            self.invert_hand_card(action - INVERT_CARD)
+        return NO_RESULT
+
+    def advance_opponent(self) -> int:
+        """End the player's turn and let the opponent move, resolving the round if it is over."""
+        if self.recorder is not None:
+            self.recorder(EVENT_ACTION, END_TURN)
+        player_sum: int = self.player_total
+        if not self.player_passed:
+            if player_sum > 20:
+                return self.resolve_round()
+            if player_sum == 20:
+                self.player_passed = True
+        self.opponent_turn()
+        return self.settle_opponent_turn()
+
+    def settle_opponent_turn(self) -> int:
+        """Apply the end-of-turn checks after the opponent moved, resolving the round if it is over."""
+        opponent_sum: int = self.opponent_total
+        if opponent_sum > 20:
+            return self.resolve_round()
+        if opponent_sum == 20:
+            self.opponent_passed = True
+        if (self.player_passed and self.opponent_passed) or not self.deck_size:
+            return self.resolve_round()
+        return NO_RESULT
+
+    def advance_player(self) -> int:
+        """Start the player's next turn by drawing a card, resolving the round if it is over."""
+        if self.player_passed:
+            return NO_RESULT
+        self.player_turn()
+        self.hand_card_played = False
+        if self.player_total == 20:
+            self.player_passed = True
+        if self.player_passed and self.opponent_passed:
+            return self.resolve_round()
+        return NO_RESULT
+
+    def resolve_round(self) -> int:
+        """Score the finished round, update the rounds won and return the round result."""
+        player_sum: int = self.player_total
+        opponent_sum: int = self.opponent_total
+        if player_sum > 20:
+            result: int = OPPONENT
+        elif opponent_sum > 20:
+            result = PLAYER
+        elif player_sum > opponent_sum:
+            result = PLAYER
+        elif opponent_sum > player_sum:
+            result = OPPONENT
+        else:
+            result = TIE
+        if result != OPPONENT:
+            self.player_rounds_won += 1
+        if result != PLAYER:
+            self.opponent_rounds_won += 1
+        self.player_passed = True
+        self.opponent_passed = True
+        self.round_ended = True
+        self.round_result = result
+        self.winner = self.check_winner()
+        if self.recorder is not None:
+            self.recorder(EVENT_ROUND_END, result)
+            if self.winner != NO_RESULT:
+                self.recorder(EVENT_MATCH_END, self.winner)
+        return result
+
+    def check_winner(self) -> int:
+        """Check if either player has won the game and return the match result."""
+        if self.player_rounds_won >= 3 and self.opponent_rounds_won >= 3:
+            return TIE
+        elif self.player_rounds_won >= 3:
+            return PLAYER
+        elif self.opponent_rounds_won >= 3:
+            return OPPONENT
+        return NO_RESULT
 
     def reset_round(self) -> None:
         """Reset the game state for a new round."""
-        self.round_ended = True
-        self.deck = [1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 8, 8, 9, 9, 10, 10]
+        if self.recorder is not None:
+            self.recorder(EVENT_ROUND_START, 0)
+        self.deck[:] = MAIN_DECK_COUNTS
+        self.deck_size = sum(MAIN_DECK_COUNTS)
         self.player_board.clear()
         self.opponent_board.clear()
+        self.player_total = 0
+        self.opponent_total = 0
         self.player_passed = False
         self.opponent_passed = False
+        self.hand_card_played = False
         self.round_ended = False
+        self.round_result = NO_RESULT
         self.start()
 
     def reset_game(self) -> None:
         """Reset the entire game state for a new game."""
+        if self.recorder is not None:
+            self.recorder(EVENT_MATCH_START, 0)
         self.reset_round()
         self.player_rounds_won = 0
         self.opponent_rounds_won = 0
-        self.player_hand_deck = [1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6]
-        self.opponent_hand_deck = [1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6]
-        self.player_hand = []
-        self.opponent_hand = []
+        self.winner = NO_RESULT
+        self.player_hand_deck[:] = self.player_hand_deck_counts
+        self.player_hand_deck_size = sum(self.player_hand_deck_counts)
+        self.opponent_hand_deck[:] = self.opponent_hand_deck_counts
+        self.opponent_hand_deck_size = sum(self.opponent_hand_deck_counts)
+        self.player_hand.clear()
+        self.opponent_hand.clear()
         self.draw_hand()
+
+    def snapshot(self) -> Snapshot:
+        """Return an immutable copy of the current game state."""
+        return Snapshot(
+            tuple(self.deck),
+            self.deck_size,
+            tuple(self.player_hand_deck),
+            self.player_hand_deck_size,
+            tuple(self.opponent_hand_deck),
+            self.opponent_hand_deck_size,
+            tuple(self.player_hand),
+            tuple(self.opponent_hand),
+            tuple(self.player_board),
+            tuple(self.opponent_board),
+            self.player_total,
+            self.opponent_total,
+            self.player_rounds_won,
+            self.opponent_rounds_won,
+            self.player_passed,
+            self.opponent_passed,
+            self.hand_card_played,
+            self.round_ended,
+            self.round_result,
+            self.winner,
+        )
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Overwrite the current game state with a snapshot, reusing the existing containers."""
+        self.deck[:] = snapshot.deck
+        self.deck_size = snapshot.deck_size
+        self.player_hand_deck[:] = snapshot.player_hand_deck
+        self.player_hand_deck_size = snapshot.player_hand_deck_size
+        self.opponent_hand_deck[:] = snapshot.opponent_hand_deck
+        self.opponent_hand_deck_size = snapshot.opponent_hand_deck_size
+        self.player_hand[:] = snapshot.player_hand
+        self.opponent_hand[:] = snapshot.opponent_hand
+        self.player_board[:] = snapshot.player_board
+        self.opponent_board[:] = snapshot.opponent_board
+        self.player_total = snapshot.player_total
+        self.opponent_total = snapshot.opponent_total
+        self.player_rounds_won = snapshot.player_rounds_won
+        self.opponent_rounds_won = snapshot.opponent_rounds_won
+        self.player_passed = snapshot.player_passed
+        self.opponent_passed = snapshot.opponent_passed
+        self.hand_card_played = snapshot.hand_card_played
+        self.round_ended = snapshot.round_ended
+        self.round_result = snapshot.round_result
+        self.winner = snapshot.winner
+
+    def clone(self) -> "Game":
+        """Return an independent copy of this game with its own RNG stream, opponent policy and side decks."""
+        game: Game = Game(
+            random.Random(self.rng.getrandbits(64)),
+            self.opponent_policy,
+            player_hand_deck_counts=self.player_hand_deck_counts,
+            opponent_hand_deck_counts=self.opponent_hand_deck_counts,
+        )
+        game.restore(self.snapshot())
+        return game
+
+    def apply(self, action: int) -> int:
+        """Apply a player action like step, remembering the prior state so it can be undone."""
+        self.history.append(self.snapshot())
+        return self.step(action)
+
+    def undo(self) -> None:
+        """Revert the most recent apply."""
+        self.restore(self.history.pop())
+
+    def position_hash(self) -> int:
+        """Return a stable 64-bit Zobrist hash of the position: deck, totals, hands, rounds and turn flags."""
+        value: int = 0
+        for idx, count in enumerate(self.deck):
+            value ^= ZOBRIST_DECK[idx][count]
+        value ^= ZOBRIST_TOTALS[0][self.player_total + TOTAL_OFFSET]
+        value ^= ZOBRIST_TOTALS[1][self.opponent_total + TOTAL_OFFSET]
+        for seat, hand in enumerate((self.player_hand, self.opponent_hand)):
+            keys: tuple[tuple[int, ...], ...] = ZOBRIST_HANDS[seat]
+            for slot, card in enumerate(hand):
+                value ^= keys[slot][card + 10]
+        value ^= ZOBRIST_ROUNDS[0][min(self.player_rounds_won, 3)]
+        value ^= ZOBRIST_ROUNDS[1][min(self.opponent_rounds_won, 3)]
+        if self.player_passed:
+            value ^= ZOBRIST_PLAYER_PASSED
+        if self.opponent_passed:
+            value ^= ZOBRIST_OPPONENT_PASSED
+        if self.hand_card_played:
+            value ^= ZOBRIST_HAND_CARD_PLAYED
+        return value
+
+    def play_round(self, policy: Callable[["Game"], int]) -> int:
+        """Play the current round to the end with the given player policy and return the round result."""
+        result: int = NO_RESULT
+        while result == NO_RESULT:
+            result = self.step(END_TURN if self.player_passed else policy(self))
+        return result
+
+    def play_match(self, policy: Callable[["Game"], int]) -> int:
+        """Play a complete match headlessly with the given player policy and return the winner."""
+        self.reset_game()
+        while True:
+            self.play_round(policy)
+            if self.winner != NO_RESULT:
+                return self.winner
+            self.reset_round()
+
+
+def basic_player_policy(game: Game) -> int:
+    """Choose the player's action with the same greedy rules the opponent uses."""
+    total: int = game.player_total
+    opponent_sum: int = game.opponent_total
+    behind: bool = game.opponent_passed and total < opponent_sum <= 20
+    if not game.hand_card_played:
+        for idx, card in enumerate(game.player_hand):
+            value: int = abs(card)
+            if total > 20:
+                if total - value <= 20:
+                    return PLAY_CARD + idx if card < 0 else INVERT_CARD + idx
+            elif total < 17 or behind:
+                new_sum: int = total + value
+                if 17 <= new_sum <= 20 and (not game.opponent_passed or new_sum >= opponent_sum):
+                    return PLAY_CARD + idx if card > 0 else INVERT_CARD + idx
+    if total > 20 or behind or total < 17:
+        return END_TURN
+    return STAND
@@ -0,0 +1,222 @@
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Callable, TextIO
+
+from game import Game, PLAYER, OPPONENT, HAND_DECK_COUNTS, basic_player_policy
+
+# Names of the opponent_respond branches, in the order the rules test them.
+BRANCH_BUST_REDUCE: str = "opponent_turn.bust_reduce"
+BRANCH_STAND_PLAYER_PASSED: str = "opponent_turn.stand_player_passed"
+BRANCH_STAND_17: str = "opponent_turn.stand_17"
+BRANCH_IMPROVE_SCORE: str = "opponent_turn.improve_score"
+BRANCH_REACH_17: str = "opponent_turn.reach_17"
+BRANCH_POLICY: str = "opponent_turn.policy"
+
+
+class EngineStats:
+    """Call counts and inclusive timings per engine phase, shared by any number of InstrumentedGames.
+
+    Every phase is a name such as "draw_card" or "play_hand_card.reduce.played" mapped to a
+    [calls, total_ns, max_ns] entry. Timings are inclusive: an opponent_turn branch also counts the
+    hand card plays made inside it. With dump_every set, a JSON line with all phases is written to
+    dump_to at most that many seconds apart, checked after each resolved round.
+    """
+
+    def __init__(self, dump_every: float | None = None, dump_to: TextIO | None = None) -> None:
+        """Start with no recorded phases and an optional periodic dump."""
+        self.phases: dict[str, list[int]] = {}
+        self.dump_every: float | None = dump_every
+        self.dump_to: TextIO = dump_to if dump_to is not None else sys.stderr
+        self.next_dump: float = time.monotonic() + dump_every if dump_every else 0.0
+
+    def add(self, name: str, elapsed_ns: int) -> None:
+        """Record one call of a phase and its duration."""
+        entry: list[int] | None = self.phases.get(name)
+        if entry is None:
+            self.phases[name] = [1, elapsed_ns, elapsed_ns]
+            return
+        entry[0] += 1
+        entry[1] += elapsed_ns
+        if elapsed_ns > entry[2]:
+            entry[2] = elapsed_ns
+
+    def count(self, name: str) -> int:
+        """Return how many times a phase ran."""
+        entry: list[int] | None = self.phases.get(name)
+        return entry[0] if entry is not None else 0
+
+    def total_ns(self, name: str) -> int:
+        """Return the total time spent in a phase in nanoseconds."""
+        entry: list[int] | None = self.phases.get(name)
+        return entry[1] if entry is not None else 0
+
+    def mean_ns(self, name: str) -> float:
+        """Return the mean duration of a phase in nanoseconds."""
+        entry: list[int] | None = self.phases.get(name)
+        return entry[1] / entry[0] if entry is not None else 0.0
+
+    def share(self, name: str, prefix: str) -> float:
+        """Return the fraction of the calls of all phases starting with prefix that went to one phase."""
+        calls: int = sum(entry[0] for key, entry in self.phases.items() if key.startswith(prefix))
+        return self.count(name) / calls if calls else 0.0
+
+    def merge(self, other: "EngineStats") -> None:
+        """Add the phases recorded by another stats object, e.g. from a worker process."""
+        for name, (calls, total, longest) in other.phases.items():
+            entry: list[int] | None = self.phases.get(name)
+            if entry is None:
+                self.phases[name] = [calls, total, longest]
+                continue
+            entry[0] += calls
+            entry[1] += total
+            entry[2] = max(entry[2], longest)
+
+    def reset(self) -> None:
+        """Forget all recorded phases."""
+        self.phases.clear()
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        """Return the phases as plain data: calls, total, mean and max duration."""
+        return {
+            name: {"calls": calls, "total_ns": total, "mean_ns": total / calls, "max_ns": longest}
+            for name, (calls, total, longest) in sorted(self.phases.items())
+        }
+
+    def report(self) -> str:
+        """Return a readable table of all phases, slowest total first."""
+        lines: list[str] = [f"{'phase':<40} {'calls':>10} {'mean us':>9} {'total ms':>10}"]
+        for name, (calls, total, _) in sorted(self.phases.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<40} {calls:>10} {total / calls / 1000:>9.2f} {total / 1e6:>10.1f}")
+        return "\n".join(lines)
+
+    def dump(self) -> None:
+        """Write all phases as one JSON line to dump_to."""
+        self.dump_to.write(json.dumps({"time": time.time(), "phases": self.as_dict()}) + "\n")
+        self.dump_to.flush()
+
+    def tick(self) -> None:
+        """Dump the phases if the periodic dump is due."""
+        if self.dump_every and time.monotonic() >= self.next_dump:
+            self.next_dump = time.monotonic() + self.dump_every
+            self.dump()
+
+
+def opponent_branch(game: Game) -> str:
+    """Return which opponent_respond branch the game's current state will take."""
+    opponent_sum: int = game.opponent_total
+    player_sum: int = game.player_total
+    if opponent_sum > 20:
+        return BRANCH_BUST_REDUCE
+    if game.player_passed and opponent_sum >= player_sum:
+        return BRANCH_STAND_PLAYER_PASSED
+    if opponent_sum >= 17:
+        return BRANCH_STAND_17 if opponent_sum >= player_sum else BRANCH_IMPROVE_SCORE
+    return BRANCH_REACH_17
+
+
+class InstrumentedGame(Game):
+    """Game that records its phases into an EngineStats; use it in place of Game to opt in.
+
+    Plain Game objects carry no instrumentation at all, so leaving it off costs nothing.
+    """
+
+    __slots__ = ("stats",)
+
+    def __init__(
+        self,
+        rng: random.Random | None = None,
+        opponent_policy: Callable[[Game], None] | None = None,
+        recorder: Callable[[int, int], None] | None = None,
+        stats: EngineStats | None = None,
+        player_hand_deck_counts: tuple[int, ...] = HAND_DECK_COUNTS,
+        opponent_hand_deck_counts: tuple[int, ...] = HAND_DECK_COUNTS,
+    ) -> None:
+        """Initialize the game like Game, recording into stats (a fresh EngineStats if not given)."""
+        super().__init__(rng, opponent_policy, recorder, player_hand_deck_counts, opponent_hand_deck_counts)
+        self.stats: EngineStats = stats if stats is not None else EngineStats()
+
+    def clone(self) -> "InstrumentedGame":
+        """Return an independent copy like Game.clone that keeps recording into the same stats."""
+        game: InstrumentedGame = InstrumentedGame(
+            random.Random(self.rng.getrandbits(64)),
+            self.opponent_policy,
+            stats=self.stats,
+            player_hand_deck_counts=self.player_hand_deck_counts,
+            opponent_hand_deck_counts=self.opponent_hand_deck_counts,
+        )
+        game.restore(self.snapshot())
+        return game
+
+    def draw_card(self) -> int:
+        """Draw a card from the main deck, timing the draw."""
+        started: int = time.perf_counter_ns()
+        card: int = Game.draw_card(self)
+        self.stats.add("draw_card", time.perf_counter_ns() - started)
+        return card
+
+    def opponent_turn(self) -> None:
+        """Perform the opponent's turn, timing it as a whole and the chosen branch separately."""
+        if self.opponent_passed:
+            return
+        started: int = time.perf_counter_ns()
+        Game.opponent_turn(self)
+        if self.opponent_policy is not None:
+            self.stats.add(BRANCH_POLICY, time.perf_counter_ns() - started)
+        self.stats.add("opponent_turn", time.perf_counter_ns() - started)
+
+    def opponent_respond(self) -> None:
+        """Apply the built-in opponent rules, timing them under the branch they take."""
+        branch: str = opponent_branch(self)
+        started: int = time.perf_counter_ns()
+        Game.opponent_respond(self)
+        self.stats.add(branch, time.perf_counter_ns() - started)
+
+    def opponent_play_hand_card(
+        self, to_reduce: bool = False, to_reach_17: bool = False, to_improve_score: bool = False
+    ) -> bool:
+        """Let the opponent play a hand card, recording the mode and whether a card was played."""
+        started: int = time.perf_counter_ns()
+        played: bool = Game.opponent_play_hand_card(self, to_reduce, to_reach_17, to_improve_score)
+        elapsed: int = time.perf_counter_ns() - started
+        mode: str = "reduce" if to_reduce else "reach_17" if to_reach_17 else "improve_score"
+        self.stats.add(f"play_hand_card.{mode}.{'played' if played else 'none'}", elapsed)
+        return played
+
+    def resolve_round(self) -> int:
+        """Score the round, recording how it ended and giving the periodic dump a chance to run."""
+        started: int = time.perf_counter_ns()
+        player_bust: bool = self.player_total > 20
+        opponent_bust: bool = self.opponent_total > 20
+        result: int = Game.resolve_round(self)
+        elapsed: int = time.perf_counter_ns() - started
+        self.stats.add("resolve_round", elapsed)
+        if player_bust:
+            outcome: str = "player_bust"
+        elif opponent_bust:
+            outcome = "opponent_bust"
+        else:
+            outcome = "player" if result == PLAYER else "opponent" if result == OPPONENT else "tie"
+        self.stats.add(f"round.{outcome}", elapsed)
+        self.stats.tick()
+        return result
+
+
+def main() -> None:
+    """Play instrumented headless matches and print the per-phase statistics."""
+    parser = argparse.ArgumentParser(description="Profile the Pazaak engine phase by phase.")
+    parser.add_argument("--matches", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dump-every", type=float, default=None, help="seconds between JSON dumps to stderr")
+    args = parser.parse_args()
+    stats: EngineStats = EngineStats(dump_every=args.dump_every)
+    game: InstrumentedGame = InstrumentedGame(random.Random(args.seed), stats=stats)
+    for _ in range(args.matches):
+        game.play_match(basic_player_policy)
+    print(stats.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import argparse
+import itertools
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+from aggregate import wilson_interval
+from game import Game, PLAYER, OPPONENT
+from strategies import Strategy, create
+
+ELO_SCALE: float = 400 / math.log(10)
+# Drawn matches added between every pair of strategies, so ratings stay finite after a clean sweep.
+PRIOR_MATCHES: float = 1.0
+
+# Strategies built in a worker process, by spec, reused by every batch the worker plays.
+_strategies: dict[str, Strategy] = {}
+
+
+@dataclass(slots=True)
+class PairRecord:
+    """Match results of one pairing, counted from the first strategy's side."""
+
+    first: int
+    second: int
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    batches: int = 0
+
+    @property
+    def matches(self) -> int:
+        """Return the number of matches played."""
+        return self.wins + self.losses + self.draws
+
+    @property
+    def score(self) -> float:
+        """Return the first strategy's score, counting a drawn match as half a win."""
+        return self.wins + 0.5 * self.draws
+
+    def decided(self, z: float) -> bool:
+        """Return whether the score interval excludes an even matchup."""
+        if not self.matches:
+            return False
+        low, high = wilson_interval(self.score, self.matches, z)
+        return high < 0.5 or low > 0.5
+
+
+def strategy(spec: str) -> Strategy:
+    """Return this process's instance of a strategy, creating it on first use."""
+    instance: Strategy | None = _strategies.get(spec)
+    if instance is None:
+        instance = _strategies[spec] = create(spec)
+    return instance
+
+
+def play_batch(first: str, second: str, seed: int, batch: int, matches: int) -> tuple[int, int, int]:
+    """Play a seeded batch between two strategies, half in each seat, and return the first's (wins, losses, draws).
+
+    The deals depend only on (seed, pairing, batch). Strategies that sample their moves, such as
+    mcts and cfr, still make the totals vary from run to run.
+    """
+    wins: int = 0
+    losses: int = 0
+    for seat, (player, opponent) in enumerate(((first, second), (second, first))):
+        player_strategy: Strategy = strategy(player)
+        rng: random.Random = random.Random(f"league:{seed}:{first}:{second}:{batch}:{seat}")
+        game: Game = Game(rng, strategy(opponent).opponent_move)
+        for _ in range(matches // 2 + (seat == 0 and matches % 2)):
+            winner: int = game.play_match(player_strategy.player_action)
+            if winner == (PLAYER if seat == 0 else OPPONENT):
+                wins += 1
+            elif winner == (OPPONENT if seat == 0 else PLAYER):
+                losses += 1
+    return wins, losses, matches - wins - losses
+
+
+def bradley_terry(count: int, records: list[PairRecord], z: float = 1.959964) -> list[tuple[float, float, float]]:
+    """Fit Bradley-Terry strengths and return each strategy's (Elo, low, high), with strategy 0 anchored at 0.
+
+    Strengths are fitted with the MM algorithm, counting draws as half a win for each side. The
+    bounds come from the inverse of the observed information matrix, so they are relative to the
+    anchor, whose rating is exact by definition.
+    """
+    wins: np.ndarray = np.zeros((count, count))
+    games: np.ndarray = np.zeros((count, count))
+    for record in records:
+        wins[record.first, record.second] += record.score
+        wins[record.second, record.first] += record.matches - record.score
+        games[record.first, record.second] += record.matches
+        games[record.second, record.first] += record.matches
+    off_diagonal: np.ndarray = 1.0 - np.eye(count)
+    wins += PRIOR_MATCHES / 2 * off_diagonal
+    games += PRIOR_MATCHES * off_diagonal
+    strengths: np.ndarray = np.ones(count)
+    for _ in range(10_000):
+        updated: np.ndarray = wins.sum(axis=1) / (games / (strengths[:, None] + strengths[None, :])).sum(axis=1)
+        updated /= updated[0]
+        converged: bool = np.max(np.abs(np.log(updated) - np.log(strengths))) < 1e-12
+        strengths = updated
+        if converged:
+            break
+    ratings: np.ndarray = np.log(strengths)
+    win_odds: np.ndarray = strengths[:, None] / (strengths[:, None] + strengths[None, :])
+    information: np.ndarray = games * win_odds * (1 - win_odds)
+    hessian: np.ndarray = np.diag(information.sum(axis=1)) - information
+    errors: np.ndarray = np.zeros(count)
+    if count > 1:
+        errors[1:] = np.sqrt(np.diag(np.linalg.inv(hessian[1:, 1:])))
+    return [
+        (ELO_SCALE * rating, ELO_SCALE * (rating - z * error), ELO_SCALE * (rating + z * error))
+        for rating, error in zip(ratings, errors)
+    ]
+
+
+def run_league(
+    specs: list[str],
+    seed: int = 0,
+    batch_size: int = 100,
+    max_batches: int = 20,
+    confidence: float = 0.95,
+    workers: int | None = None,
+) -> list[PairRecord]:
+    """Play every pairing in rounds of batches, stopping pairings once their winner is clear.
+
+    Every pairing plays one batch per round until its score interval excludes 0.5 or it reaches
+    max_batches, so the compute goes to the close matchups. Rounds are played across a process pool.
+    """
+    z: float = NormalDist().inv_cdf(0.5 + confidence / 2)
+    records: list[PairRecord] = [
+        PairRecord(first, second) for first, second in itertools.combinations(range(len(specs)), 2)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            scheduled: list[PairRecord] = [
+                record for record in records if record.batches < max_batches and not record.decided(z)
+            ]
+            if not scheduled:
+                return records
+            results = executor.map(
+                play_batch,
+                [specs[record.first] for record in scheduled],
+                [specs[record.second] for record in scheduled],
+                itertools.repeat(seed),
+                [record.batches for record in scheduled],
+                itertools.repeat(batch_size),
+            )
+            for record, (wins, losses, draws) in zip(scheduled, results):
+                record.wins += wins
+                record.losses += losses
+                record.draws += draws
+                record.batches += 1
+
+
+def main() -> None:
+    """Run a league between registered strategies from the command line and print their ratings."""
+    parser = argparse.ArgumentParser(description="Rate Pazaak strategies against each other in an adaptive league.")
+    parser.add_argument("strategies", nargs="*", default=["baseline", "mcts"], help="specs like baseline, mcts:300")
+    parser.add_argument("--batch", type=int, default=100, help="matches per pairing per round")
+    parser.add_argument("--max-batches", type=int, default=20, help="most rounds one pairing plays")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    started: float = time.perf_counter()
+    records: list[PairRecord] = run_league(
+        args.strategies, args.seed, args.batch, args.max_batches, args.confidence, args.workers
+    )
+    elapsed: float = time.perf_counter() - started
+    z: float = NormalDist().inv_cdf(0.5 + args.confidence / 2)
+    ratings: list[tuple[float, float, float]] = bradley_terry(len(args.strategies), records, z)
+    for idx in sorted(range(len(args.strategies)), key=lambda idx: -ratings[idx][0]):
+        rating, low, high = ratings[idx]
+        print(f"{rating:+7.1f}  [{low:+7.1f}, {high:+7.1f}]  {args.strategies[idx]}")
+    for record in records:
+        print(
+            f"{args.strategies[record.first]} vs {args.strategies[record.second]}: "
+            f"{record.wins}-{record.losses}-{record.draws} over {record.matches} matches"
+        )
+    print(f"{sum(record.matches for record in records)} matches in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,24 @@
+import os
+import sys
+import time
+
+from matchlog import MatchLogWriter
 from pazaakui import PazaakUI
+from winprob import WinTable
+
+# Round win estimates shown in the window are kept here between sessions.
+WIN_TABLE_PATH: str = "win_estimates.bin"
+# Every session's games are logged here, one match log per session, for analysis.py.
+GAMES_DIR: str = "games"
 
 if __name__ == "__main__":
-    PazaakUI()
+    win_table: WinTable = WinTable(WIN_TABLE_PATH)
+    os.makedirs(GAMES_DIR, exist_ok=True)
+    log_path: str = os.path.join(GAMES_DIR, time.strftime("%Y%m%d-%H%M%S.log"))
+    with MatchLogWriter(log_path, flush_matches=True) as writer:
+        if "--mcts" in sys.argv:
+            from mcts import MCTSOpponent
+
+            PazaakUI(MCTSOpponent(), win_table, writer)
+        else:
+            PazaakUI(win_table=win_table, recorder=writer)
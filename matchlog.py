@@ -0,0 +1,271 @@
+import argparse
+import mmap
+import random
+import struct
+import time
+from array import array
+from collections import deque
+from typing import Callable, Iterable, Iterator
+
+from game import (
+    Game,
+    basic_player_policy,
+    EVENT_MATCH_START,
+    EVENT_ROUND_START,
+    EVENT_PLAYER_DRAW,
+    EVENT_OPPONENT_DRAW,
+    EVENT_PLAYER_DEAL,
+    EVENT_ACTION,
+    EVENT_OPPONENT_PLAY,
+    EVENT_OPPONENT_PASS,
+    EVENT_ROUND_END,
+    EVENT_MATCH_END,
+)
+
+LOG_MAGIC: bytes = b"PZKL"
+INDEX_MAGIC: bytes = b"PZKI"
+LOG_VERSION: int = 1
+FILE_HEADER: struct.Struct = struct.Struct("<4sI")
+# Every event is one fixed-width record: an unsigned event code and a signed value.
+RECORD: struct.Struct = struct.Struct("<Bb")
+READ_CHUNK: int = 1 << 16
+
+# Events that make the engine move on replay; the others are consumed or checked along the way. The
+# round start logged right after a match start belongs to Game.reset_game and is not replayed again.
+DRIVER_EVENTS: frozenset[int] = frozenset((EVENT_MATCH_START, EVENT_ROUND_START, EVENT_ACTION))
+CHECK_EVENTS: frozenset[int] = frozenset((EVENT_ROUND_END, EVENT_MATCH_END))
+
+
+def index_path(path: str) -> str:
+    """Return the path of the match index stored next to a log file."""
+    return path + ".idx"
+
+
+class MatchLogWriter:
+    """Append-only writer usable directly as a Game recorder: Game(recorder=MatchLogWriter(path)).
+
+    Records are buffered and written in bulk. The byte offset of every match start is collected and
+    saved to the index file on close, so matches can later be found by id (their order in the log).
+    With flush_matches, every finished match is written out at once, so a session that is killed
+    before close keeps its finished matches; MatchLog rebuilds the missing index by a scan.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 20, flush_matches: bool = False) -> None:
+        """Create the log file, write its header and start an empty buffer."""
+        self.path: str = path
+        self.buffer_size: int = buffer_size
+        self.flush_matches: bool = flush_matches
+        self.file = open(path, "wb")
+        self.file.write(FILE_HEADER.pack(LOG_MAGIC, LOG_VERSION))
+        self.file.flush()
+        self.written: int = FILE_HEADER.size
+        self.buffer: bytearray = bytearray()
+        self.offsets: array = array("Q")
+
+    def __call__(self, event: int, value: int) -> None:
+        """Append one event record."""
+        if event == EVENT_MATCH_START:
+            self.offsets.append(self.written + len(self.buffer))
+        self.buffer.append(event)
+        self.buffer.append(value & 0xFF)
+        if len(self.buffer) >= self.buffer_size or (self.flush_matches and event == EVENT_MATCH_END):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records to the file."""
+        self.file.write(self.buffer)
+        self.file.flush()
+        self.written += len(self.buffer)
+        self.buffer.clear()
+
+    def close(self) -> None:
+        """Flush the remaining records, close the log and write its match index."""
+        self.flush()
+        self.file.close()
+        with open(index_path(self.path), "wb") as file:
+            file.write(FILE_HEADER.pack(INDEX_MAGIC, LOG_VERSION))
+            file.write(self.offsets.tobytes())
+
+    def __enter__(self) -> "MatchLogWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def check_header(data: bytes, magic: bytes, path: str) -> None:
+    """Raise ValueError unless data starts with the expected file header."""
+    found_magic, version = FILE_HEADER.unpack_from(data, 0)
+    if found_magic != magic or version != LOG_VERSION:
+        raise ValueError(f"{path} is not a version {LOG_VERSION} match log file")
+
+
+def read_records(path: str) -> Iterator[tuple[int, int]]:
+    """Stream every (event, value) record of a log file in constant memory."""
+    with open(path, "rb") as file:
+        check_header(file.read(FILE_HEADER.size), LOG_MAGIC, path)
+        while chunk := file.read(READ_CHUNK):
+            yield from RECORD.iter_unpack(chunk)
+
+
+class MatchLog:
+    """Memory-mapped match log with random access to matches by id."""
+
+    def __init__(self, path: str) -> None:
+        """Map the log into memory and load its index, rebuilding it by a scan if the index is missing."""
+        with open(path, "rb") as file:
+            self.data: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        check_header(self.data, LOG_MAGIC, path)
+        self.offsets: array = array("Q")
+        try:
+            with open(index_path(path), "rb") as file:
+                check_header(file.read(FILE_HEADER.size), INDEX_MAGIC, index_path(path))
+                self.offsets.frombytes(file.read())
+        except FileNotFoundError:
+            for position in range(FILE_HEADER.size, len(self.data), RECORD.size):
+                if self.data[position] == EVENT_MATCH_START:
+                    self.offsets.append(position)
+
+    def __len__(self) -> int:
+        """Return the number of matches in the log."""
+        return len(self.offsets)
+
+    def records(self, match_id: int) -> Iterator[tuple[int, int]]:
+        """Iterate over the (event, value) records of one match."""
+        start: int = self.offsets[match_id]
+        end: int = self.offsets[match_id + 1] if match_id + 1 < len(self.offsets) else len(self.data)
+        return RECORD.iter_unpack(memoryview(self.data)[start:end])
+
+    def replay(self, match_id: int) -> Iterator[tuple[int, int, Game]]:
+        """Replay one match; see replay."""
+        return replay(self.records(match_id))
+
+    def close(self) -> None:
+        """Unmap the log file."""
+        self.data.close()
+
+
+class ScriptedRandom(random.Random):
+    """RNG stand-in that makes the engine draw exactly the cards recorded in a log."""
+
+    def __init__(self, pending: deque) -> None:
+        """Serve draws from the pending record queue shared with the replay."""
+        super().__init__(0)
+        self.pending: deque = pending
+        self.game: Game | None = None
+
+    def randrange(self, size: int) -> int:
+        """Return the index that selects the next recorded card from the count array being drawn from."""
+        event, card = self.pending.popleft()
+        if event in (EVENT_PLAYER_DRAW, EVENT_OPPONENT_DRAW):
+            counts: list[int] = self.game.deck
+        elif event == EVENT_PLAYER_DEAL:
+            counts = self.game.player_hand_deck
+        else:
+            counts = self.game.opponent_hand_deck
+        return sum(counts[: card - 1])
+
+
+def scripted_opponent(pending: deque) -> Callable[[Game], None]:
+    """Return an opponent policy that repeats the hand card plays and pass recorded in a log."""
+
+    def play(game: Game) -> None:
+        while pending and pending[0][0] in (EVENT_OPPONENT_PLAY, EVENT_OPPONENT_PASS):
+            event, card = pending.popleft()
+            if event == EVENT_OPPONENT_PASS:
+                game.opponent_passed = True
+                continue
+            for idx, held in enumerate(game.opponent_hand):
+                if held == abs(card):
+                    game.opponent_hand.pop(idx)
+                    break
+            game.opponent_board.append(card)
+            game.opponent_total += card
+
+    return play
+
+
+def replay(records: Iterable[tuple[int, int]]) -> Iterator[tuple[int, int, Game]]:
+    """Replay recorded events into a Game, yielding (event, value, game) after each player or engine step.
+
+    The engine itself re-runs every step; draws come from the log through ScriptedRandom and the
+    opponent's moves through scripted_opponent, so the replay is exact whatever opponent policy was
+    used. Round and match results in the log are checked against the replayed game.
+    """
+    pending: deque = deque()
+    rng: ScriptedRandom = ScriptedRandom(pending)
+    game: Game = Game(rng, scripted_opponent(pending))
+    rng.game = game
+    checks: list[tuple[int, int]] = []
+    driver: tuple[int, int] | None = None
+    for event, value in records:
+        if event == EVENT_ROUND_START and driver is not None and driver[0] == EVENT_MATCH_START and not pending:
+            continue
+        if event in DRIVER_EVENTS:
+            if driver is not None:
+                run_step(game, driver, pending, checks)
+                yield driver[0], driver[1], game
+            driver = (event, value)
+        elif event in CHECK_EVENTS:
+            checks.append((event, value))
+        else:
+            pending.append((event, value))
+    if driver is not None:
+        run_step(game, driver, pending, checks)
+        yield driver[0], driver[1], game
+
+
+def run_step(game: Game, driver: tuple[int, int], pending: deque, checks: list[tuple[int, int]]) -> None:
+    """Run one recorded step in the engine and verify it consumed and produced what the log says."""
+    event, value = driver
+    if event == EVENT_MATCH_START:
+        game.reset_game()
+    elif event == EVENT_ROUND_START:
+        game.reset_round()
+    else:
+        game.step(value)
+    if pending:
+        raise ValueError(f"replay diverged from the log: unconsumed events {list(pending)}")
+    for check, expected in checks:
+        actual: int = game.round_result if check == EVENT_ROUND_END else game.winner
+        if actual != expected:
+            raise ValueError(f"replay diverged from the log: event {check} expected {expected}, got {actual}")
+    checks.clear()
+
+
+def record_matches(path: str, matches: int, seed: int = 0) -> None:
+    """Play headless matches with the basic player policy and log them all to one file."""
+    with MatchLogWriter(path) as writer:
+        game: Game = Game(random.Random(seed), recorder=writer)
+        for _ in range(matches):
+            game.play_match(basic_player_policy)
+
+
+def main() -> None:
+    """Record simulated matches to a log, or replay one match from a log."""
+    parser = argparse.ArgumentParser(description="Record and replay binary Pazaak match logs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="simulate matches and log them")
+    record.add_argument("path")
+    record.add_argument("--matches", type=int, default=10_000)
+    record.add_argument("--seed", type=int, default=0)
+    show = commands.add_parser("replay", help="replay one match and print its steps")
+    show.add_argument("path")
+    show.add_argument("--match", type=int, default=0)
+    args = parser.parse_args()
+    if args.command == "record":
+        started: float = time.perf_counter()
+        record_matches(args.path, args.matches, args.seed)
+        print(f"logged {args.matches} matches in {time.perf_counter() - started:.2f}s")
+        return
+    log: MatchLog = MatchLog(args.path)
+    for event, value, game in log.replay(args.match):
+        print(
+            f"event={event} value={value} player={game.player_total} opponent={game.opponent_total} "
+            f"rounds={game.player_rounds_won}-{game.opponent_rounds_won}"
+        )
+    log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import math
+import random
+import time
+
+from game import Game, Snapshot, NO_RESULT, PLAYER, OPPONENT, TIE, basic_player_policy
+
+# Rewards from the opponent's point of view, indexed by match result.
+REWARDS: dict[int, float] = {PLAYER: 0.0, OPPONENT: 1.0, TIE: 0.5}
+
+# An opponent action: (hand index or -1 for no card, sign of the played card, stand after playing).
+OpponentAction = tuple[int, int, bool]
+
+
+def legal_actions(game: Game) -> list[OpponentAction]:
+    """List the opponent's choices after its draw: at most one hand card with either sign, then stand or not.
+
+    Choices that leave the opponent over 20 lose the round on the spot, so they are only kept when
+    nothing else is possible.
+    """
+    total: int = game.opponent_total
+    actions: list[OpponentAction] = [(-1, 1, False), (-1, 1, True)] if total <= 20 else []
+    seen: set[int] = set()
+    for idx, card in enumerate(game.opponent_hand):
+        if card in seen:
+            continue
+        seen.add(card)
+        for sign in (1, -1):
+            if total + sign * card <= 20:
+                actions.append((idx, sign, False))
+                actions.append((idx, sign, True))
+    return actions or [(-1, 1, True)]
+
+
+def apply_action(game: Game, action: OpponentAction) -> None:
+    """Apply an opponent action to a game whose opponent has just drawn."""
+    idx, sign, stand = action
+    if idx >= 0:
+        card: int = game.opponent_hand.pop(idx) * sign
+        game.opponent_board.append(card)
+        game.opponent_total += card
+    if stand:
+        game.opponent_passed = True
+
+
+class Node:
+    """Statistics of one opponent decision point in the search tree."""
+
+    __slots__ = ("actions", "visits", "action_visits", "action_values")
+
+    def __init__(self, actions: list[OpponentAction]) -> None:
+        """Create an unvisited node for the given legal actions."""
+        self.actions: list[OpponentAction] = actions
+        self.visits: int = 0
+        self.action_visits: list[int] = [0] * len(actions)
+        self.action_values: list[float] = [0.0] * len(actions)
+
+
+class MCTSOpponent:
+    """Monte Carlo tree search opponent that can replace the built-in rules via Game(opponent_policy=...).
+
+    Each move runs UCT simulations on a scratch game until the time or rollout budget is spent. The
+    hidden deck order is determinized by drawing from the remaining deck counts in every simulation,
+    and the player is modeled with basic_player_policy. Nodes are keyed by Game.position_hash, so the
+    tree built on one turn is reused when a later turn reaches a position it already explored, and
+    simulations restore a Game.snapshot of the decision point.
+    """
+
+    def __init__(
+        self,
+        time_budget: float = 0.02,
+        rollouts: int | None = None,
+        exploration: float = 1.0,
+        max_nodes: int = 200_000,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Configure the per-move budget (seconds and/or simulations) and the search parameters."""
+        self.time_budget: float = time_budget
+        self.rollouts: int | None = rollouts
+        self.exploration: float = exploration
+        self.max_nodes: int = max_nodes
+        self.nodes: dict[int, Node] = {}
+        self.path: list[tuple[Node, int]] = []
+        self.descending: bool = False
+        self.scratch: Game = Game(rng if rng is not None else random.Random(), self.tree_policy)
+
+    def __call__(self, game: Game) -> None:
+        """Search from the opponent's current decision point and play the most visited action."""
+        if len(self.nodes) > self.max_nodes:
+            self.nodes.clear()
+        root: Node = self.node(game)
+        snapshot: Snapshot = game.snapshot()
+        deadline: float = time.perf_counter() + self.time_budget if self.time_budget else math.inf
+        simulations: int = 0
+        while (self.rollouts is None or simulations < self.rollouts) and time.perf_counter() < deadline:
+            self.simulate(snapshot)
+            simulations += 1
+        best: int = max(range(len(root.actions)), key=root.action_visits.__getitem__)
+        apply_action(game, root.actions[best])
+
+    def node(self, game: Game) -> Node:
+        """Return the node of a game's decision point, creating it if needed."""
+        key: int = game.position_hash()
+        node: Node | None = self.nodes.get(key)
+        if node is None:
+            node = Node(legal_actions(game))
+            self.nodes[key] = node
+        return node
+
+    def simulate(self, snapshot: Snapshot) -> None:
+        """Run one simulation from a snapshot of the decision point and back up its result."""
+        scratch: Game = self.scratch
+        scratch.restore(snapshot)
+        self.path.clear()
+        self.descending = True
+        self.tree_policy(scratch)
+        result: int = scratch.settle_opponent_turn()
+        if result == NO_RESULT:
+            result = scratch.advance_player()
+        if result == NO_RESULT:
+            scratch.play_round(basic_player_policy)
+        while scratch.winner == NO_RESULT:
+            scratch.reset_round()
+            scratch.play_round(basic_player_policy)
+        reward: float = REWARDS[scratch.winner]
+        for node, idx in self.path:
+            node.visits += 1
+            node.action_visits[idx] += 1
+            node.action_values[idx] += reward
+
+    def tree_policy(self, game: Game) -> None:
+        """Pick the opponent's move inside a simulation: UCT in the tree, the built-in rules in the rollout."""
+        if not self.descending:
+            game.opponent_respond()
+            return
+        key: int = game.position_hash()
+        node: Node | None = self.nodes.get(key)
+        if node is None:
+            node = Node(legal_actions(game))
+            self.nodes[key] = node
+            self.descending = False
+        idx: int = self.select(node)
+        self.path.append((node, idx))
+        apply_action(game, node.actions[idx])
+
+    def select(self, node: Node) -> int:
+        """Return the UCT choice at a node, trying every action once first."""
+        log_visits: float = math.log(node.visits + 1)
+        best_idx: int = 0
+        best_score: float = -math.inf
+        for idx, visits in enumerate(node.action_visits):
+            if not visits:
+                return idx
+            score: float = node.action_values[idx] / visits + self.exploration * math.sqrt(log_visits / visits)
+            if score > best_score:
+                best_idx, best_score = idx, score
+        return best_idx
@@ -1,13 +1,47 @@
 from tkinter import *
 from tkinter import messagebox
-from game import Game
-import time
+from game import Game, NO_RESULT, PLAYER, OPPONENT, TIE, STAND, PLAY_CARD, INVERT_CARD
+from winprob import WinTable, BackgroundEstimator, Estimate
+import queue
+import threading
+from typing import Callable
+
+ROUND_MESSAGES: dict[int, str] = {
+    PLAYER: "You won the round.",
+    OPPONENT: "You lost the round.",
+    TIE: "It's a tie.",
+}
+GAME_MESSAGES: dict[int, tuple[str, str]] = {
+    PLAYER: ("Congratulations", "You won the game."),
+    OPPONENT: ("Defeat", "You lost the game."),
+    TIE: ("Draw", "The game ended in a draw."),
+}
+# Delay before the player's draw so the opponent's move stays visible, and the worker polling interval.
+OPPONENT_DELAY_MS: int = 1000
+POLL_MS: int = 20
+# How often the win estimate label picks up the background estimator's refinements.
+ESTIMATE_POLL_MS: int = 250
 
 
 class PazaakUI:
-    def __init__(self) -> None:
-        """Initialize the game UI, set up the window, widgets, and start the game."""
-        self.game: Game = Game()
+    def __init__(
+        self,
+        opponent_policy: Callable[[Game], None] | None = None,
+        win_table: WinTable | None = None,
+        recorder: Callable[[int, int], None] | None = None,
+    ) -> None:
+        """Initialize the game UI, set up the window, widgets, and start the game.
+
+        win_table holds the round win estimates shown next to the score; it is saved when the window
+        is closed. Without one, estimates are kept in memory only. recorder, e.g. a
+        matchlog.MatchLogWriter, receives every event of the games played in the window.
+        """
+        self.game: Game = Game(opponent_policy=opponent_policy, recorder=recorder)
+        self.win_table: WinTable = win_table if win_table is not None else WinTable()
+        self.estimator: BackgroundEstimator = BackgroundEstimator(self.win_table)
+        self.estimate_key: int | None = None
+        self.opponent_results: queue.Queue[int] = queue.Queue()
+        self.shown_text: dict[Widget, object] = {}
         self.window: Tk = Tk()
         self.window.title("Pazaak")
         self.window.config(padx=20, pady=20, background="black")
@@ -17,6 +51,8 @@ class PazaakUI:
         self.score_label.grid(column=0, row=0)
         self.score_label_opponent: Label = Label(text="X", fg="white", background="black")
         self.score_label_opponent.grid(column=5, row=0)
+        self.estimate_label: Label = Label(text="", fg="white", background="black")
+        self.estimate_label.grid(column=4, row=0)
         self.dot_labels: list[Label] = []
 
         for i in range(1, 4):
@@ -63,6 +99,8 @@ class PazaakUI:
             label.grid(column=i + 5, row=4)
             self.opponent_hand_labels.append(label)
 
+        self.invert_buttons: list[Button] = []
+
         for i in range(4):
             button = Button(
                 text="invert",
@@ -71,6 +109,7 @@ class PazaakUI:
                 command=lambda idx=i: self.ui_invert_card(idx),
             )
             button.grid(column=i, row=5)
+            self.invert_buttons.append(button)
         self.next_button: Button = Button(
             text="next", fg="white", background="black", command=self.process_turn
         )
@@ -81,23 +120,18 @@ class PazaakUI:
         self.pass_button.grid(column=4, row=5)
 
         self.show_rules()
-        self.game.draw_hand()
-        self.game.start()
+        self.game.reset_game()
         self.update_ui()
+        self.request_estimate()
+        self.window.after(ESTIMATE_POLL_MS, self.poll_estimate)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
         self.window.mainloop()
 
-    def update_hand_cards_ui(self) -> None:
-        """Update the UI to reflect the current state of the player's and opponent's hand cards."""
-        for i, button in enumerate(self.hand_card_buttons):
-            if i < len(self.game.player_hand):
-                button.config(text=self.game.player_hand[i])
-            else:
-                button.config(text="X")
-        for i, label in enumerate(self.opponent_hand_labels):
-            if i < len(self.game.opponent_hand):
-                label.config(text=self.game.opponent_hand[i])
-            else:
-                label.config(text="X")
+    def set_text(self, widget: Widget, text: object) -> None:
+        """Reconfigure a widget's text only if it differs from what is already shown."""
+        if self.shown_text.get(widget) != text:
+            self.shown_text[widget] = text
+            widget.config(text=text)
 
     def update_ui(self) -> None:
         """Update the entire UI, including boards, hand cards, and score labels."""
@@ -107,49 +141,66 @@ class PazaakUI:
 
     def update_board_ui(self) -> None:
         """Update the UI to reflect the current state of the boards."""
-        self.score_label.config(text=(sum(self.game.player_board)))
+        self.set_text(self.score_label, self.game.player_total)
         for i, label in enumerate(self.card_labels):
-            if i < len(self.game.player_board):
-                label.config(text=self.game.player_board[i])
-            else:
-                label.config(text="X")
-        self.score_label_opponent.config(text=(sum(self.game.opponent_board)))
+            self.set_text(label, self.game.player_board[i] if i < len(self.game.player_board) else "X")
+        self.set_text(self.score_label_opponent, self.game.opponent_total)
         for i, label in enumerate(self.card_labels_opponent):
-            if i < len(self.game.opponent_board):
-                label.config(text=self.game.opponent_board[i])
-            else:
-                label.config(text="X")
+            self.set_text(label, self.game.opponent_board[i] if i < len(self.game.opponent_board) else "X")
 
     def update_hand_card_ui(self) -> None:
         """Update the UI for the player's and opponent's hand cards."""
         for i, button in enumerate(self.hand_card_buttons):
-            if i < len(self.game.player_hand):
-                button.config(text=self.game.player_hand[i])
-            else:
-                button.config(text="X")
+            self.set_text(button, self.game.player_hand[i] if i < len(self.game.player_hand) else "X")
         for i, label in enumerate(self.opponent_hand_labels):
-            if i < len(self.game.opponent_hand):
-                label.config(text=self.game.opponent_hand[i])
-            else:
-                label.config(text="X")
+            self.set_text(label, self.game.opponent_hand[i] if i < len(self.game.opponent_hand) else "X")
+
+    def request_estimate(self) -> None:
+        """Ask the background estimator about the player's current decision, if the player has one."""
+        if self.game.player_passed or self.game.round_ended:
+            self.estimate_key = None
+            self.estimator.cancel()
+        else:
+            self.estimate_key = self.estimator.request(self.game)
+        self.update_estimate_ui()
+
+    def update_estimate_ui(self) -> None:
+        """Show the round win probability and the expected results of drawing on and of passing."""
+        if self.estimate_key is None:
+            self.set_text(self.estimate_label, "")
+            return
+        estimate: Estimate | None = self.win_table.get(self.estimate_key)
+        if estimate is None or not estimate.sample_count():
+            self.set_text(self.estimate_label, "estimating...")
+            return
+        self.set_text(
+            self.estimate_label,
+            f"win {estimate.win_probability():.0%}\ndraw {estimate.value(0):+.2f}\npass {estimate.value(1):+.2f}",
+        )
+
+    def poll_estimate(self) -> None:
+        """Refresh the estimate label periodically while the background estimator refines it."""
+        self.update_estimate_ui()
+        self.window.after(ESTIMATE_POLL_MS, self.poll_estimate)
+
+    def close(self) -> None:
+        """Save the win estimates and close the window."""
+        self.estimator.cancel()
+        self.win_table.save()
+        self.window.destroy()
 
     def update_score_labels(self) -> None:
         """Update the score labels to show the number of rounds won by each player."""
         for i, label in enumerate(self.dot_labels):
-            if i < self.game.player_rounds_won:
-                label.config(text="O")
-            else:
-                label.config(text="X")
+            self.set_text(label, "O" if i < self.game.player_rounds_won else "X")
         for i, label in enumerate(self.dot_labels_opponent):
-            if i < self.game.opponent_rounds_won:
-                label.config(text="O")
-            else:
-                label.config(text="X")
+            self.set_text(label, "O" if i < self.game.opponent_rounds_won else "X")
 
     def ui_invert_card(self, index: int) -> None:
         """Invert the value of a hand card in the UI and update the UI."""
-        self.game.invert_hand_card(index)
-        self.update_hand_cards_ui()
+        self.game.step(INVERT_CARD + index)
+        self.update_hand_card_ui()
+        self.request_estimate()
 
     def disable_hand_cards(self) -> None:
         """Disable the player's hand card buttons."""
@@ -162,16 +213,23 @@ class PazaakUI:
             button["state"] = "normal"
 
     def reset_round_ui(self) -> None:
-        """Reset the UI and game state for a new round."""
-        self.game.reset_round()
+        """Reset the UI and game state for a new round, or for a new game once the match is decided."""
+        if self.game.winner != NO_RESULT:
+            self.game.reset_game()
+        else:
+            self.game.reset_round()
+        self.enable_pass_button()
+        self.enable_hand_cards()
         self.update_ui()
+        self.request_estimate()
 
     def ui_play_hand_card(self, index: int) -> None:
         """Handle the event of playing a hand card and update the UI."""
-        card_played: bool = self.game.player_play_hand_card(index)
-        if card_played:
+        self.game.step(PLAY_CARD + index)
+        if self.game.hand_card_played:
             self.update_ui()
             self.disable_hand_cards()
+            self.request_estimate()
 
     def disable_pass_button(self) -> None:
         """Disable the pass button."""
@@ -181,133 +239,77 @@ class PazaakUI:
         """Enable the pass button."""
         self.pass_button["state"] = "normal"
 
-    def sleep(self) -> None:
-        """Disable buttons, update UI, and wait for 1 second."""
+    def lock_controls(self) -> None:
+        """Disable every control while the opponent is moving."""
+        self.estimator.cancel()
+        self.estimate_key = None
+        self.update_estimate_ui()
         self.next_button["state"] = "disabled"
-        if not self.game.player_passed:
-            self.pass_button["state"] = "disabled"
+        self.pass_button["state"] = "disabled"
         self.disable_hand_cards()
-        self.window.update_idletasks()
-        self.window.update()
-        time.sleep(1)
+        for button in self.invert_buttons:
+            button["state"] = "disabled"
 
-    def end_sleep(self) -> None:
-        """Re-enable buttons after sleep."""
+    def unlock_controls(self) -> None:
+        """Re-enable the controls the player may use after the opponent's move."""
         self.next_button["state"] = "normal"
         if not self.game.player_passed:
             self.pass_button["state"] = "normal"
         self.enable_hand_cards()
-
-    def player_turn_ui(self) -> None:
-        """Perform the player's turn in the UI and update the game state."""
-        self.check_game_state()
-        self.game.player_turn()
-        self.update_ui()
-        self.check_game_state()
-
-    def opponent_turn_ui(self) -> None:
-        """Perform the opponent's turn in the UI and update the game state."""
-        self.game.opponent_turn()
-        self.update_ui()
-        self.check_game_state()
+        for button in self.invert_buttons:
+            button["state"] = "normal"
 
     def process_turn(self) -> None:
-        """Handle the sequence of actions in a turn, including player and opponent moves."""
-        if self.game.round_ended:
-            self.game.round_ended = False
+        """End the player's turn and let the opponent think on a worker thread without blocking the window."""
+        self.lock_controls()
+        threading.Thread(target=self.think, daemon=True).start()
+        self.window.after(POLL_MS, self.poll_opponent)
+
+    def think(self) -> None:
+        """Run the opponent's move off the Tk thread and post the round result back to the main loop."""
+        self.opponent_results.put(self.game.advance_opponent())
+
+    def poll_opponent(self) -> None:
+        """Show the opponent's move once the worker is done, then schedule the player's draw."""
+        try:
+            result: int = self.opponent_results.get_nowait()
+        except queue.Empty:
+            self.window.after(POLL_MS, self.poll_opponent)
             return
-        self.handle_exceeding_20()
-        self.opponent_turn_ui()
-        self.handle_exceeding_20()
-        if self.game.round_ended:
-            self.game.round_ended = False
-            return
-        self.sleep()
-        self.end_sleep()
-        self.enable_hand_cards()
-        if not self.game.player_passed:
-            self.player_turn_ui()
-            if self.game.round_ended:
-                self.game.round_ended = False
-                return
-
-    def check_game_state(self) -> None:
-        """Check the current game state to determine if any immediate actions are required."""
-        player_sum: int = sum(self.game.player_board)
-        opponent_sum: int = sum(self.game.opponent_board)
-
-        if player_sum == 20 and not self.game.player_passed:
-            self.game.player_passed = True
-            self.disable_pass_button()
-
-        if opponent_sum == 20 and not self.game.opponent_passed:
-            self.game.opponent_passed = True
-            self.disable_pass_button()
-
-        if self.game.player_passed and self.game.opponent_passed:
-            self.evaluate_round_result()
-
-    def handle_exceeding_20(self) -> None:
-        """Handle the scenario where a player's total exceeds 20."""
-        player_sum: int = sum(self.game.player_board)
-        opponent_sum: int = sum(self.game.opponent_board)
-
-        if player_sum > 20 and not self.game.player_passed:
-            self.game.player_passed = True
-            self.game.opponent_passed = True
-            self.disable_pass_button()
-            self.evaluate_round_result()
+        self.update_ui()
+        if result != NO_RESULT:
+            self.unlock_controls()
+            self.show_round_result(result)
             return
+        self.window.after(OPPONENT_DELAY_MS, self.finish_turn)
 
-        if opponent_sum > 20 and not self.game.opponent_passed:
-            self.game.player_passed = True
-            self.game.opponent_passed = True
+    def finish_turn(self) -> None:
+        """Draw the player's card for the next turn after the opponent's move has been on screen."""
+        result: int = self.game.advance_player()
+        self.unlock_controls()
+        self.update_ui()
+        self.request_estimate()
+        if self.game.player_passed:
             self.disable_pass_button()
-            self.evaluate_round_result()
+        if result != NO_RESULT:
+            self.show_round_result(result)
 
     def player_pass(self) -> None:
         """Handle the player passing their turn."""
-        self.game.player_passed = True
+        result: int = self.game.step(STAND)
         self.disable_pass_button()
-        if self.game.player_passed and self.game.opponent_passed:
-            if self.evaluate_round_result():
-                self.reset_round_ui()
-
-    def evaluate_round_result(self) -> bool:
-        """Evaluate the result of a round and update the game state accordingly."""
-        player_sum: int = sum(self.game.player_board)
-        opponent_sum: int = sum(self.game.opponent_board)
-        if self.game.player_passed and self.game.opponent_passed:
-            if player_sum > 20:
-                self.update_ui()
-                self.game.opponent_rounds_won += 1
-                messagebox.showinfo(title="End of Round", message="You lost the round.")
-            elif opponent_sum > 20:
-                self.update_ui()
-                self.game.player_rounds_won += 1
-                messagebox.showinfo(
-                    title="End of Round",
-                    message="You won the round.",
-                )
-            elif player_sum > opponent_sum:
-                self.update_ui()
-                self.game.player_rounds_won += 1
-                messagebox.showinfo(title="End of Round", message="You won the round.")
-            elif opponent_sum > player_sum:
-                self.update_ui()
-                self.game.opponent_rounds_won += 1
-                messagebox.showinfo(title="End of Round", message="You lost the round.")
-            else:
-                self.update_ui()
-                self.game.player_rounds_won += 1
-                self.game.opponent_rounds_won += 1
-                messagebox.showinfo(title="End of Round", message="It's a tie.")
-            self.game.check_winner()
-            self.reset_round_ui()
-            self.enable_pass_button()
-            self.game.round_ended = True
-            return True
-        return False
+        self.request_estimate()
+        if result != NO_RESULT:
+            self.show_round_result(result)
+
+    def show_round_result(self, result: int) -> None:
+        """Announce the result of a finished round, then start the next round or game."""
+        self.update_ui()
+        messagebox.showinfo(title="End of Round", message=ROUND_MESSAGES[result])
+        if self.game.winner != NO_RESULT:
+            title, message = GAME_MESSAGES[self.game.winner]
+            messagebox.showinfo(title=title, message=message)
+        self.reset_round_ui()
 
     def show_rules(self) -> None:
         """Display the game rules to the player."""
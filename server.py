@@ -0,0 +1,362 @@
+import argparse
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from aggregate import percentile
+from game import Game, Snapshot, NO_RESULT, END_TURN, ACTION_COUNT, basic_player_policy
+
+# Opponents a table can be opened with; the search opponents run their moves on the process pool.
+OPPONENTS: tuple[str, ...] = ("builtin", "mcts")
+DEFAULT_PORT: int = 8765
+
+# Protocol, one command per line, one reply line per command:
+#   NEW [opponent]          -> OK <id> <state>
+#   MOVE <id> <action>      -> OK <id> <state>    (action is a Game.step action number, 0-9)
+#   STATE <id>              -> OK <id> <state>
+#   CLOSE <id>              -> OK <id> closed
+# Errors reply ERR <message>. A connection can only use the sessions it opened, which close with it.
+# A state is space-separated key=value fields; see format_state.
+
+# Per-process scratch games, one per opponent, onto which session snapshots are restored.
+_tables: dict[str, Game] = {}
+
+
+class Session:
+    """Compact state of one table: the game snapshot, the move count and the opponent name.
+
+    The RNG is not kept: every move reseeds the scratch game from (server seed, session id, move
+    count), so a session is a few hundred bytes and can be moved to any worker process.
+    """
+
+    __slots__ = ("snapshot", "moves", "opponent", "result", "busy")
+
+    def __init__(self, snapshot: Snapshot, opponent: str) -> None:
+        """Start a session at a freshly dealt match."""
+        self.snapshot: Snapshot = snapshot
+        self.moves: int = 0
+        self.opponent: str = opponent
+        self.result: int = NO_RESULT
+        self.busy: bool = False
+
+
+def table(opponent: str) -> Game:
+    """Return this process's scratch game for an opponent, creating it on first use."""
+    game: Game | None = _tables.get(opponent)
+    if game is None:
+        if opponent == "mcts":
+            from mcts import MCTSOpponent
+
+            game = Game(opponent_policy=MCTSOpponent())
+        else:
+            game = Game()
+        _tables[opponent] = game
+    return game
+
+
+def new_match(opponent: str, seed: str) -> Snapshot:
+    """Deal a new match and return its snapshot."""
+    game: Game = table(opponent)
+    game.rng.seed(seed)
+    game.reset_game()
+    return game.snapshot()
+
+
+def play_move(snapshot: Snapshot, opponent: str, seed: str, action: int) -> tuple[Snapshot, int]:
+    """Apply one player action to a session snapshot and return the new snapshot and the round result.
+
+    Like the window, a finished round is followed straight away by the next one unless the match is
+    decided. This runs inline for cheap moves and in a worker process for search opponents.
+    """
+    game: Game = table(opponent)
+    game.rng.seed(seed)
+    game.restore(snapshot)
+    result: int = game.step(action)
+    if result != NO_RESULT and game.winner == NO_RESULT:
+        game.reset_round()
+    return game.snapshot(), result
+
+
+async def read_command(reader: asyncio.StreamReader) -> bytes | None:
+    """Read one command line: b"" at the end of the stream, None for a line over the stream limit.
+
+    The whole of an oversized line is skipped, so the next read starts at the next command.
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+    except asyncio.LimitOverrunError as error:
+        consumed: int = error.consumed
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+
+def format_cards(cards: tuple[int, ...]) -> str:
+    """Return cards as a comma-separated list, or - when there are none."""
+    return ",".join(map(str, cards)) if cards else "-"
+
+
+def format_state(snapshot: Snapshot, result: int) -> str:
+    """Return the player's view of a table as key=value fields; the opponent's hand is only counted."""
+    return (
+        f"result={result} winner={snapshot.winner} player={snapshot.player_total} "
+        f"opponent={snapshot.opponent_total} hand={format_cards(snapshot.player_hand)} "
+        f"board={format_cards(snapshot.player_board)} opponent_board={format_cards(snapshot.opponent_board)} "
+        f"opponent_hand={len(snapshot.opponent_hand)} "
+        f"rounds={snapshot.player_rounds_won},{snapshot.opponent_rounds_won} "
+        f"passed={int(snapshot.player_passed)},{int(snapshot.opponent_passed)} played={int(snapshot.hand_card_played)}"
+    )
+
+
+class TableServer:
+    """asyncio server hosting many player-vs-AI tables over a line-delimited protocol.
+
+    Sessions live in memory as Session objects. Moves that only involve the built-in opponent are
+    applied inline; moves that make a search opponent think run on a process pool, so the event
+    loop keeps serving other tables meanwhile. Sessions opened on a connection close with it.
+    """
+
+    def __init__(self, seed: int = 0, workers: int | None = None) -> None:
+        """Create the session table and the worker pool for expensive opponent moves."""
+        self.seed: int = seed
+        self.sessions: dict[int, Session] = {}
+        self.next_id: int = 1
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(max_workers=workers)
+
+    def move_seed(self, session_id: int, moves: int) -> str:
+        """Return the RNG seed of a session's move, which makes built-in opponent tables reproducible.
+
+        Search opponents are not: their simulations depend on the time budget and on the tree the
+        worker kept from earlier moves.
+        """
+        return f"table:{self.seed}:{session_id}:{moves}"
+
+    async def dispatch(self, line: str, owned: set[int]) -> str:
+        """Run one protocol command and return its reply line."""
+        parts: list[str] = line.split()
+        if not parts:
+            return "ERR empty command"
+        command: str = parts[0].upper()
+        if command == "NEW":
+            opponent: str = parts[1] if len(parts) > 1 else OPPONENTS[0]
+            if opponent not in OPPONENTS:
+                return f"ERR unknown opponent {opponent}"
+            session_id: int = self.next_id
+            self.next_id += 1
+            session: Session = Session(new_match(opponent, self.move_seed(session_id, 0)), opponent)
+            self.sessions[session_id] = session
+            owned.add(session_id)
+            return f"OK {session_id} {format_state(session.snapshot, NO_RESULT)}"
+        if command not in ("MOVE", "STATE", "CLOSE") or len(parts) < 2 or not parts[1].isdigit():
+            return f"ERR bad command {line.strip()}"
+        session_id = int(parts[1])
+        session = self.sessions.get(session_id)
+        if session is None or session_id not in owned:
+            return f"ERR no session {session_id}"
+        if command == "STATE":
+            return f"OK {session_id} {format_state(session.snapshot, session.result)}"
+        if command == "CLOSE":
+            del self.sessions[session_id]
+            owned.discard(session_id)
+            return f"OK {session_id} closed"
+        if len(parts) < 3 or not parts[2].isdigit() or int(parts[2]) >= ACTION_COUNT:
+            return f"ERR bad action {line.strip()}"
+        if session.busy:
+            return f"ERR session {session_id} busy"
+        if session.snapshot.winner != NO_RESULT:
+            return f"ERR session {session_id} match over"
+        action: int = int(parts[2])
+        session.moves += 1
+        seed: str = self.move_seed(session_id, session.moves)
+        if action == END_TURN and session.opponent != "builtin":
+            session.busy = True
+            try:
+                snapshot, result = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, play_move, session.snapshot, session.opponent, seed, action
+                )
+            finally:
+                session.busy = False
+        else:
+            snapshot, result = play_move(session.snapshot, session.opponent, seed, action)
+        session.snapshot = snapshot
+        session.result = result
+        return f"OK {session_id} {format_state(snapshot, result)}"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection until it closes, then drop the sessions it opened.
+
+        A connection can only use the sessions it opened. Lines longer than the stream limit are
+        answered with an error instead of closing the connection.
+        """
+        owned: set[int] = set()
+        try:
+            while (line := await read_command(reader)) != b"":
+                if line is None:
+                    reply: str = "ERR line too long"
+                else:
+                    reply = await self.dispatch(line.decode("ascii", "replace"), owned)
+                writer.write((reply + "\n").encode("ascii", "replace"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in owned:
+                self.sessions.pop(session_id, None)
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: str | None = None) -> None:
+        """Listen on a TCP port, or on a Unix socket when path is given, until cancelled."""
+        if path is not None:
+            server: asyncio.Server = await asyncio.start_unix_server(self.handle, path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+
+class TableView:
+    """Player's view of a table parsed from a state line, enough for basic_player_policy."""
+
+    __slots__ = (
+        "result",
+        "winner",
+        "player_total",
+        "opponent_total",
+        "player_hand",
+        "player_passed",
+        "opponent_passed",
+        "hand_card_played",
+    )
+
+    def __init__(self, fields: list[str]) -> None:
+        """Parse the key=value fields of a state."""
+        state: dict[str, str] = dict(field.split("=", 1) for field in fields)
+        self.result: int = int(state["result"])
+        self.winner: int = int(state["winner"])
+        self.player_total: int = int(state["player"])
+        self.opponent_total: int = int(state["opponent"])
+        self.player_hand: list[int] = [] if state["hand"] == "-" else [int(card) for card in state["hand"].split(",")]
+        player_passed, opponent_passed = state["passed"].split(",")
+        self.player_passed: bool = player_passed == "1"
+        self.opponent_passed: bool = opponent_passed == "1"
+        self.hand_card_played: bool = state["played"] == "1"
+
+
+class TableClient:
+    """Minimal asyncio client for the table protocol."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Wrap an open connection."""
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: str | None = None) -> "TableClient":
+        """Connect over TCP, or over a Unix socket when path is given."""
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, line: str) -> tuple[int, TableView | None]:
+        """Send one command and return the session id and state of its reply; raise on ERR."""
+        self.writer.write((line + "\n").encode("ascii"))
+        await self.writer.drain()
+        reply: list[str] = (await self.reader.readline()).decode("ascii").split()
+        if not reply or reply[0] != "OK":
+            raise RuntimeError(" ".join(reply) or "connection closed")
+        return int(reply[1]), TableView(reply[2:]) if reply[2] != "closed" else None
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def play_sessions(client: TableClient, count: int, opponent: str, latencies: list[int]) -> None:
+    """Play count full matches on one connection with basic_player_policy, recording each move's latency."""
+    for _ in range(count):
+        session_id, view = await client.request(f"NEW {opponent}")
+        while view.winner == NO_RESULT:
+            action: int = END_TURN if view.player_passed else basic_player_policy(view)
+            started: int = time.perf_counter_ns()
+            _, view = await client.request(f"MOVE {session_id} {action}")
+            latencies.append(time.perf_counter_ns() - started)
+        await client.request(f"CLOSE {session_id}")
+
+
+async def run_load(
+    sessions: int,
+    connections: int,
+    opponent: str = OPPONENTS[0],
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    path: str | None = None,
+) -> dict:
+    """Play sessions matches over concurrent connections and return latency percentiles and throughput."""
+    clients: list[TableClient] = [await TableClient.connect(host, port, path) for _ in range(connections)]
+    latencies: list[int] = []
+    started: float = time.perf_counter()
+    await asyncio.gather(
+        *(
+            play_sessions(client, sessions // connections + (idx < sessions % connections), opponent, latencies)
+            for idx, client in enumerate(clients)
+        )
+    )
+    elapsed: float = time.perf_counter() - started
+    for client in clients:
+        await client.close()
+    latencies.sort()
+    return {
+        "sessions": sessions,
+        "moves": len(latencies),
+        "seconds": elapsed,
+        "sessions_per_sec": sessions / elapsed,
+        "p50_ms": percentile(latencies, 0.50) / 1e6,
+        "p99_ms": percentile(latencies, 0.99) / 1e6,
+    }
+
+
+def main() -> None:
+    """Run the table server or the load generator from the command line."""
+    parser = argparse.ArgumentParser(description="Host many Pazaak tables over asyncio, or load test a host.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the table server")
+    serve.add_argument("--seed", type=int, default=0)
+    serve.add_argument("--workers", type=int, default=None, help="processes for search opponent moves")
+    load = commands.add_parser("load", help="play matches against a running server and report latency")
+    load.add_argument("--sessions", type=int, default=1000, help="matches to play")
+    load.add_argument("--connections", type=int, default=100, help="concurrent connections")
+    load.add_argument("--opponent", choices=OPPONENTS, default=OPPONENTS[0])
+    for command in (serve, load):
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=DEFAULT_PORT)
+        command.add_argument("--unix", default=None, help="Unix socket path to use instead of TCP")
+    args = parser.parse_args()
+    if args.command == "serve":
+        try:
+            asyncio.run(TableServer(args.seed, args.workers).serve(args.host, args.port, args.unix))
+        except KeyboardInterrupt:
+            pass
+        return
+    stats: dict = asyncio.run(
+        run_load(args.sessions, args.connections, args.opponent, args.host, args.port, args.unix)
+    )
+    print(
+        f"{stats['sessions']} sessions, {stats['moves']} moves in {stats['seconds']:.2f}s: "
+        f"{stats['sessions_per_sec']:.1f} sessions/s, p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+
+from game import Game, PLAYER, OPPONENT, HAND_DECK_COUNTS, basic_player_policy
+
+# Cards in a side deck: the size of the default hand deck, 12 cards.
+SIDE_DECK_SIZE: int = sum(HAND_DECK_COUNTS)
+CARD_VALUES: int = 6
+
+
+@dataclass(slots=True)
+class Candidate:
+    """Running match tally of one side deck composition played by the player against the built-in AI."""
+
+    counts: tuple[int, ...]
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+
+    @property
+    def matches(self) -> int:
+        """Return the number of matches played so far."""
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        """Return the mean match score, counting a drawn match as half a win."""
+        return (self.wins + 0.5 * self.draws) / self.matches if self.matches else 0.0
+
+    def variance(self) -> float:
+        """Return the sample variance of the per-match score."""
+        matches: int = self.matches
+        if not matches:
+            return 0.25
+        score: float = self.score
+        return max((self.wins + 0.25 * self.draws) / matches - score * score, 1e-9)
+
+    def worse_than(self, leader: "Candidate", z: float) -> bool:
+        """Return whether this deck scores significantly below the leader in a one-sided z test."""
+        gap: float = leader.score - self.score
+        return gap > z * math.sqrt(leader.variance() / leader.matches + self.variance() / self.matches)
+
+
+def side_decks(size: int = SIDE_DECK_SIZE, max_copies: int = 4, values: int = CARD_VALUES) -> list[tuple[int, ...]]:
+    """Enumerate every side deck of the given size with at most max_copies of each card value 1..values."""
+    return [
+        counts + (0,) * (len(HAND_DECK_COUNTS) - values)
+        for counts in itertools.product(range(max_copies + 1), repeat=values)
+        if sum(counts) == size
+    ]
+
+
+def describe(counts: tuple[int, ...]) -> str:
+    """Return a side deck as a compact "value x copies" list."""
+    return " ".join(f"{idx + 1}x{count}" for idx, count in enumerate(counts) if count)
+
+
+def play_batch(counts: tuple[int, ...], seed: int, batch: int, matches: int) -> tuple[int, int, int]:
+    """Play one seeded batch of matches with a player side deck and return (wins, draws, losses)."""
+    game: Game = Game(random.Random(f"sidedeck:{seed}:{counts}:{batch}"), player_hand_deck_counts=counts)
+    wins: int = 0
+    losses: int = 0
+    for _ in range(matches):
+        winner: int = game.play_match(basic_player_policy)
+        if winner == PLAYER:
+            wins += 1
+        elif winner == OPPONENT:
+            losses += 1
+    return wins, matches - wins - losses, losses
+
+
+def optimize(
+    candidates: list[tuple[int, ...]],
+    seed: int = 0,
+    batch_size: int = 200,
+    max_matches: int = 25_600,
+    confidence: float = 0.95,
+    keep: int = 1,
+    workers: int | None = None,
+) -> tuple[list[Candidate], int]:
+    """Race side decks against the built-in AI and return them ranked, with the number of matches played.
+
+    The surviving decks are tested after batch_size, 2 * batch_size, 4 * batch_size, ... matches, up
+    to max_matches. At each test a deck is dropped when a one-sided z test finds it worse than the
+    current leader. The tests are Bonferroni-corrected over all decks and all tests, so the chance
+    of ever dropping the best deck stays under 1 - confidence; doubling the matches between tests
+    keeps that correction small. The race ends when at most keep decks
+    survive. Dropped decks are ranked after the survivors by their score when they were dropped.
+    Batches are seeded by (seed, deck, batch index), so the result does not depend on the workers.
+    """
+    tests: int = max(1, math.ceil(math.log2(max(1, max_matches // batch_size))) + 1)
+    z: float = NormalDist().inv_cdf(1 - (1 - confidence) / (len(candidates) * tests))
+    alive: list[Candidate] = [Candidate(counts) for counts in candidates]
+    dropped: list[Candidate] = []
+    played: int = 0
+    batches: int = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for test in range(tests):
+            target: int = min(2**test, max(1, max_matches // batch_size))
+            tasks: list[tuple[Candidate, int]] = [
+                (candidate, batch) for candidate in alive for batch in range(batches, target)
+            ]
+            results = executor.map(
+                play_batch,
+                [candidate.counts for candidate, _ in tasks],
+                itertools.repeat(seed),
+                [batch for _, batch in tasks],
+                itertools.repeat(batch_size),
+                chunksize=max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1))),
+            )
+            for (candidate, _), (wins, draws, losses) in zip(tasks, results):
+                candidate.wins += wins
+                candidate.draws += draws
+                candidate.losses += losses
+            played += batch_size * len(tasks)
+            batches = target
+            leader: Candidate = max(alive, key=lambda candidate: candidate.score)
+            survivors: list[Candidate] = []
+            for candidate in alive:
+                (dropped if candidate.worse_than(leader, z) else survivors).append(candidate)
+            alive = survivors
+            if len(alive) <= keep:
+                break
+    alive.sort(key=lambda candidate: candidate.score, reverse=True)
+    dropped.sort(key=lambda candidate: candidate.score, reverse=True)
+    return alive + dropped, played
+
+
+def main() -> None:
+    """Search side deck compositions from the command line and print the best ones."""
+    parser = argparse.ArgumentParser(description="Find the side decks that win most against the built-in AI.")
+    parser.add_argument("--max-copies", type=int, default=4, help="most copies of one card value in a deck")
+    parser.add_argument("--batch", type=int, default=200, help="matches per task and before the first test")
+    parser.add_argument("--max-matches", type=int, default=25_600, help="most matches one deck can play")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--keep", type=int, default=1, help="stop when this many decks remain")
+    parser.add_argument("--top", type=int, default=10, help="decks to print")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    candidates: list[tuple[int, ...]] = side_decks(max_copies=args.max_copies)
+    started: float = time.perf_counter()
+    ranked, played = optimize(
+        candidates, args.seed, args.batch, args.max_matches, args.confidence, args.keep, args.workers
+    )
+    elapsed: float = time.perf_counter() - started
+    for candidate in ranked[: args.top]:
+        print(f"{candidate.score:.4f} over {candidate.matches:>6} matches  {describe(candidate.counts)}")
+    print(
+        f"{len(candidates)} decks, {played:,} matches played instead of {len(candidates) * args.max_matches:,} "
+        f"in {elapsed:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+import argparse
+import itertools
+import mmap
+import random
+import struct
+import time
+
+from decision_table import OpponentTable
+from game import Game, END_TURN, STAND, PLAY_CARD, INVERT_CARD, MAIN_DECK_COUNTS, HAND_DECK_COUNTS
+
+# Solver actions: END_TURN and STAND as in the engine, then "play hand card value v" with a
+# positive sign (PLAY_POSITIVE + v - 1) or a negative sign (PLAY_NEGATIVE + v - 1).
+PLAY_POSITIVE: int = 2
+PLAY_NEGATIVE: int = 12
+
+TABLE_MAGIC: bytes = b"PZKT"
+TABLE_VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sIQQ")
+RECORD: struct.Struct = struct.Struct("<QfB3x")
+HASH_MULTIPLIER: int = 0x9E3779B97F4A7C15
+MASK_64: int = (1 << 64) - 1
+
+# Chance of each card value on a draw. The solver draws with replacement from the full deck
+# composition, which removes the remaining-deck dimension from the state space.
+DRAW_ODDS: tuple[tuple[int, float], ...] = tuple(
+    (idx + 1, count / sum(MAIN_DECK_COUNTS)) for idx, count in enumerate(MAIN_DECK_COUNTS) if count
+)
+
+
+def pack_hand(hand: tuple[int, ...]) -> int:
+    """Pack up to four hand card values (1-10) into a base-11 integer."""
+    code: int = 0
+    for card in reversed(hand):
+        code = code * 11 + card
+    return code
+
+
+def state_key(
+    player_total: int,
+    opponent_total: int,
+    player_hand: tuple[int, ...],
+    opponent_hand: tuple[int, ...],
+    opponent_passed: bool,
+    card_played: bool,
+) -> int:
+    """Pack a canonical player decision point into a nonzero 64-bit key.
+
+    Canonical form: the player's hand is the sorted multiset of absolute values (the sign is chosen
+    when a card is played), and the opponent's hand keeps its order because the built-in opponent
+    plays the first card that fits.
+    """
+    return (
+        (1 << 63)
+        | (player_total + 64)
+        | (opponent_total + 64) << 7
+        | pack_hand(player_hand) << 14
+        | pack_hand(opponent_hand) << 28
+        | opponent_passed << 42
+        | card_played << 43
+    )
+
+
+def resolve(player_total: int, opponent_total: int) -> float:
+    """Return the player's round value for final totals: 1 for a win, -1 for a loss and 0 for a tie."""
+    if player_total > 20:
+        return -1.0
+    if opponent_total > 20 or player_total > opponent_total:
+        return 1.0
+    if opponent_total > player_total:
+        return -1.0
+    return 0.0
+
+
+def game_state(game: Game) -> tuple:
+    """Return the canonical solver state of the player's current decision point in a game."""
+    return (
+        game.player_total,
+        game.opponent_total,
+        tuple(sorted(abs(card) for card in game.player_hand)),
+        tuple(game.opponent_hand),
+        game.opponent_passed,
+        game.hand_card_played,
+    )
+
+
+def game_state_key(game: Game) -> int:
+    """Return the table key of the player's current decision point in a game."""
+    return state_key(*game_state(game))
+
+
+def to_engine_action(game: Game, action: int) -> int:
+    """Translate a solver action into the next Game.step action, inverting the chosen card first if needed."""
+    if action < PLAY_POSITIVE:
+        return action
+    if action < PLAY_NEGATIVE:
+        value, sign = action - PLAY_POSITIVE + 1, 1
+    else:
+        value, sign = action - PLAY_NEGATIVE + 1, -1
+    for idx, card in enumerate(game.player_hand):
+        if abs(card) == value:
+            return PLAY_CARD + idx if card * sign > 0 else INVERT_CARD + idx
+    raise ValueError(f"no hand card with value {value}")
+
+
+class Solver:
+    """Memoized expectimax of the player's best response to the built-in opponent within one round.
+
+    Values are the player's expected round result (1 win, 0 tie, -1 loss). By default hand cards are
+    free to spend, so the solution maximizes the current round rather than the whole match; with
+    hand_values, the round's end is also worth hand_values[n] when the player keeps n hand cards for
+    later rounds. Draws follow DRAW_ODDS: tracking the exact remaining deck multiplies the states per
+    round start into the tens of millions, which no full enumeration could cover.
+    """
+
+    def __init__(self, hand_values: tuple[float, ...] = ()) -> None:
+        """Create an empty solver with its memo tables and the compiled opponent decision table."""
+        self.hand_values: tuple[float, ...] = hand_values
+        self.table: dict[int, tuple[float, int]] = {}
+        self.stand_values: dict[int, float] = {}
+        self.draw_values: dict[int, float] = {}
+        self.opponent: OpponentTable = OpponentTable()
+
+    def respond(
+        self, opponent_total: int, player_total: int, player_passed: bool, opponent_hand: tuple[int, ...]
+    ) -> tuple[int, tuple[int, ...], bool]:
+        """Run the opponent's decision after its draw and return its new total, hand and pass flag."""
+        total, hand, _, passed = self.opponent.lookup(opponent_total, player_total, player_passed, opponent_hand)
+        return total, hand, passed
+
+    def kept_value(self, player_hand: tuple[int, ...]) -> float:
+        """Return the value of the hand cards the player still holds when the round ends."""
+        return self.hand_values[len(player_hand)] if self.hand_values else 0.0
+
+    def stand_value(
+        self, player_total: int, opponent_total: int, opponent_hand: tuple[int, ...], opponent_passed: bool
+    ) -> float:
+        """Return the value of the player having passed, with the opponent left to finish the round."""
+        if player_total > 20 or opponent_passed:
+            return resolve(player_total, opponent_total)
+        key: int = state_key(player_total, opponent_total, (), opponent_hand, False, False)
+        value = self.stand_values.get(key)
+        if value is not None:
+            return value
+        value = 0.0
+        for card, odds in DRAW_ODDS:
+            total, hand, passed = self.respond(opponent_total + card, player_total, True, opponent_hand)
+            if total >= 20 or passed:
+                value += odds * resolve(player_total, total)
+            else:
+                value += odds * self.stand_value(player_total, total, hand, False)
+        self.stand_values[key] = value
+        return value
+
+    def end_turn_value(
+        self,
+        player_total: int,
+        opponent_total: int,
+        player_hand: tuple[int, ...],
+        opponent_hand: tuple[int, ...],
+        opponent_passed: bool,
+    ) -> float:
+        """Return the value of ending the turn: the opponent moves, then the player draws."""
+        kept: float = self.kept_value(player_hand)
+        if player_total >= 20:
+            return self.stand_value(player_total, opponent_total, opponent_hand, opponent_passed) + kept
+        if opponent_passed:
+            outcomes: list = [(1.0, (opponent_total, opponent_hand, True))]
+        else:
+            outcomes = [
+                (odds, self.respond(opponent_total + card, player_total, False, opponent_hand))
+                for card, odds in DRAW_ODDS
+            ]
+        value: float = 0.0
+        for odds, (total, hand, passed) in outcomes:
+            if total > 20:
+                value += odds * (1.0 + kept)
+            else:
+                value += odds * self.draw_value(player_total, total, player_hand, hand, passed or total == 20)
+        return value
+
+    def draw_value(
+        self,
+        player_total: int,
+        opponent_total: int,
+        player_hand: tuple[int, ...],
+        opponent_hand: tuple[int, ...],
+        opponent_passed: bool,
+    ) -> float:
+        """Return the value of the player drawing the card that starts their next turn."""
+        key: int = state_key(player_total, opponent_total, player_hand, opponent_hand, opponent_passed, False)
+        value = self.draw_values.get(key)
+        if value is not None:
+            return value
+        value = 0.0
+        for card, odds in DRAW_ODDS:
+            new_total: int = player_total + card
+            if new_total == 20:
+                value += odds * (
+                    self.stand_value(new_total, opponent_total, opponent_hand, opponent_passed)
+                    + self.kept_value(player_hand)
+                )
+            else:
+                value += odds * self.solve(new_total, opponent_total, player_hand, opponent_hand, opponent_passed, False)[0]
+        self.draw_values[key] = value
+        return value
+
+    def solve(
+        self,
+        player_total: int,
+        opponent_total: int,
+        player_hand: tuple[int, ...],
+        opponent_hand: tuple[int, ...],
+        opponent_passed: bool,
+        card_played: bool,
+    ) -> tuple[float, int]:
+        """Return the optimal (value, solver action) at a player decision point."""
+        key: int = state_key(player_total, opponent_total, player_hand, opponent_hand, opponent_passed, card_played)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+        best_value: float = self.stand_value(
+            player_total, opponent_total, opponent_hand, opponent_passed
+        ) + self.kept_value(player_hand)
+        best_action: int = STAND
+        if player_total < 20:
+            value: float = self.end_turn_value(
+                player_total, opponent_total, player_hand, opponent_hand, opponent_passed
+            )
+            if value > best_value:
+                best_value, best_action = value, END_TURN
+        if not card_played:
+            for idx, card in enumerate(player_hand):
+                if idx and card == player_hand[idx - 1]:
+                    continue
+                rest: tuple[int, ...] = player_hand[:idx] + player_hand[idx + 1 :]
+                for sign, base in ((1, PLAY_POSITIVE), (-1, PLAY_NEGATIVE)):
+                    value = self.solve(
+                        player_total + sign * card, opponent_total, rest, opponent_hand, opponent_passed, True
+                    )[0]
+                    if value > best_value:
+                        best_value, best_action = value, base + card - 1
+        result: tuple[float, int] = (best_value, best_action)
+        self.table[key] = result
+        return result
+
+    def best_action(self, game: Game) -> int:
+        """Return the optimal Game.step action for the player in a game."""
+        if game.player_passed:
+            return END_TURN
+        return to_engine_action(game, self.solve(*game_state(game))[1])
+
+    def build(self, roots: list[tuple]) -> None:
+        """Solve the round from every given (opening card, player hand, opponent hand) start."""
+        for first_card, player_hand, opponent_hand in roots:
+            self.solve(first_card, 0, tuple(sorted(player_hand)), tuple(opponent_hand), False, False)
+
+
+def round_starts(hand_size: int = 4) -> list[tuple]:
+    """Enumerate every canonical round start: opening card, player hand multiset and ordered opponent hand.
+
+    With 4-card hands there are 1,053,000 of them, and each one takes the pure-Python solver close to
+    a second, so a policy table is built from a sample of them rather than the full enumeration.
+    """
+    hand_deck: list[int] = [value for idx, count in enumerate(HAND_DECK_COUNTS) for value in [idx + 1] * count]
+    player_hands: set[tuple[int, ...]] = set(itertools.combinations(hand_deck, hand_size))
+    opponent_hands: set[tuple[int, ...]] = set(itertools.permutations(hand_deck, hand_size))
+    return [
+        (first_card, player_hand, opponent_hand)
+        for first_card, _ in DRAW_ODDS
+        for player_hand in sorted(player_hands)
+        for opponent_hand in sorted(opponent_hands)
+    ]
+
+
+def write_table(path: str, entries: dict[int, tuple[float, int]]) -> None:
+    """Write solved states to an open-addressing hash table file that can be memory-mapped."""
+    bits: int = max(4, (2 * len(entries) - 1).bit_length())
+    capacity: int = 1 << bits
+    mask: int = capacity - 1
+    buffer: bytearray = bytearray(HEADER.size + capacity * RECORD.size)
+    HEADER.pack_into(buffer, 0, TABLE_MAGIC, TABLE_VERSION, capacity, len(entries))
+    used: bytearray = bytearray(capacity)
+    shift: int = 64 - bits
+    for key, (value, action) in entries.items():
+        slot: int = ((key * HASH_MULTIPLIER) & MASK_64) >> shift
+        while used[slot]:
+            slot = (slot + 1) & mask
+        used[slot] = 1
+        RECORD.pack_into(buffer, HEADER.size + slot * RECORD.size, key, value, action)
+    with open(path, "wb") as file:
+        file.write(buffer)
+
+
+class PolicyTable:
+    """Read-only, memory-mapped view of a solved policy table with O(1) expected lookups.
+
+    The table is a partial cache: it holds the states reached from the sampled round starts it was
+    built from, and best_action solves any other state with the fallback solver.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Map the table file into memory and validate its header."""
+        with open(path, "rb") as file:
+            self.data: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.capacity, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"{path} is not a version {TABLE_VERSION} policy table")
+        self.mask: int = self.capacity - 1
+        self.shift: int = 64 - (self.capacity.bit_length() - 1)
+
+    def lookup(self, key: int) -> tuple[float, int] | None:
+        """Return the stored (value, solver action) for a state key, or None if it was not solved."""
+        slot: int = ((key * HASH_MULTIPLIER) & MASK_64) >> self.shift
+        while True:
+            stored, value, action = RECORD.unpack_from(self.data, HEADER.size + slot * RECORD.size)
+            if stored == key:
+                return value, action
+            if not stored:
+                return None
+            slot = (slot + 1) & self.mask
+
+    def best_action(self, game: Game, fallback: Solver | None = None) -> int:
+        """Return the optimal Game.step action for the player, solving unseen states with the fallback solver."""
+        if game.player_passed:
+            return END_TURN
+        entry: tuple[float, int] | None = self.lookup(game_state_key(game))
+        if entry is None:
+            if fallback is None:
+                raise KeyError("state is not in the policy table")
+            return fallback.best_action(game)
+        return to_engine_action(game, entry[1])
+
+    def close(self) -> None:
+        """Unmap the table file."""
+        self.data.close()
+
+
+def main() -> None:
+    """Build a policy table from the command line."""
+    parser = argparse.ArgumentParser(description="Solve the player's best response to the built-in opponent.")
+    parser.add_argument("output", help="path of the binary policy table to write")
+    parser.add_argument("--hand-size", type=int, default=4, help="hand size of the enumerated round starts")
+    parser.add_argument(
+        "--sample", type=int, default=1000, help="random round starts to solve; 0 solves all of them, which takes days"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    roots: list[tuple] = round_starts(args.hand_size)
+    if args.sample:
+        roots = random.Random(args.seed).sample(roots, min(args.sample, len(roots)))
+    started: float = time.perf_counter()
+    solver: Solver = Solver()
+    solver.build(roots)
+    write_table(args.output, solver.table)
+    print(f"solved {len(roots)} round starts, {len(solver.table)} states in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import random
+
+from game import (
+    Game,
+    Snapshot,
+    NO_RESULT,
+    PLAYER,
+    OPPONENT,
+    TIE,
+    END_TURN,
+    STAND,
+    PLAY_CARD,
+    INVERT_CARD,
+    basic_player_policy,
+)
+
+# Most steps a player-seat strategy may take for one opponent turn before the turn is ended for it.
+MAX_TURN_STEPS: int = 8
+SWAPPED_RESULTS: dict[int, int] = {NO_RESULT: NO_RESULT, PLAYER: OPPONENT, OPPONENT: PLAYER, TIE: TIE}
+
+
+def mirror(snapshot: Snapshot) -> Snapshot:
+    """Return the snapshot with the seats swapped, as the opponent sees the game.
+
+    Opponent hands hold unsigned values, so the player's hand loses its signs, and the new player
+    has not played a hand card yet, since the seat to move is at the start of its decision.
+    """
+    return Snapshot(
+        snapshot.deck,
+        snapshot.deck_size,
+        snapshot.opponent_hand_deck,
+        snapshot.opponent_hand_deck_size,
+        snapshot.player_hand_deck,
+        snapshot.player_hand_deck_size,
+        snapshot.opponent_hand,
+        tuple(abs(card) for card in snapshot.player_hand),
+        snapshot.opponent_board,
+        snapshot.player_board,
+        snapshot.opponent_total,
+        snapshot.player_total,
+        snapshot.opponent_rounds_won,
+        snapshot.player_rounds_won,
+        snapshot.opponent_passed,
+        snapshot.player_passed,
+        False,
+        snapshot.round_ended,
+        SWAPPED_RESULTS[snapshot.round_result],
+        SWAPPED_RESULTS[snapshot.winner],
+    )
+
+
+class Strategy:
+    """Pluggable strategy that can sit in either seat.
+
+    player_action picks the player's next Game.step action; opponent_move makes the opponent's
+    decision after its draw, like Game(opponent_policy=...). A subclass implements at least one of
+    them: the other one runs it on a scratch game with the seats swapped.
+    """
+
+    name: str = "strategy"
+
+    def __init__(self) -> None:
+        """Create the scratch game used to play the seat this strategy does not implement."""
+        self.scratch: Game = Game(random.Random(0))
+
+    def player_action(self, game: Game) -> int:
+        """Return the player's next action by asking opponent_move what it would do in the player's place."""
+        scratch: Game = self.scratch
+        scratch.restore(mirror(game.snapshot()))
+        played_from: int = len(scratch.opponent_board)
+        self.opponent_move(scratch)
+        if not game.hand_card_played and len(scratch.opponent_board) > played_from:
+            card: int = scratch.opponent_board[played_from]
+            for idx, held in enumerate(game.player_hand):
+                if abs(held) == abs(card):
+                    return PLAY_CARD + idx if held == card else INVERT_CARD + idx
+        return STAND if scratch.opponent_passed else END_TURN
+
+    def opponent_move(self, game: Game) -> None:
+        """Make the opponent's decision by running player_action in the opponent's place."""
+        scratch: Game = self.scratch
+        scratch.restore(mirror(game.snapshot()))
+        for _ in range(MAX_TURN_STEPS):
+            action: int = self.player_action(scratch)
+            if action == STAND:
+                game.opponent_passed = True
+                return
+            if INVERT_CARD <= action:
+                scratch.invert_hand_card(action - INVERT_CARD)
+                continue
+            if action == END_TURN or scratch.hand_card_played or action - PLAY_CARD >= len(scratch.player_hand):
+                return
+            card: int = scratch.player_hand[action - PLAY_CARD]
+            scratch.hand_card_played = scratch.player_play_hand_card(action - PLAY_CARD)
+            game.opponent_hand.remove(abs(card))
+            game.opponent_board.append(card)
+            game.opponent_total += card
+
+
+class BaselineStrategy(Strategy):
+    """The built-in rules: Game.opponent_respond in the opponent seat and the same greedy rules as the player."""
+
+    name = "baseline"
+
+    def player_action(self, game: Game) -> int:
+        """Play the player's seat with basic_player_policy."""
+        return basic_player_policy(game)
+
+    def opponent_move(self, game: Game) -> None:
+        """Play the opponent's seat with the built-in rules."""
+        game.opponent_respond()
+
+
+class MCTSStrategy(Strategy):
+    """Monte Carlo tree search with a fixed simulation budget per move, so its strength does not depend on the host."""
+
+    name = "mcts"
+
+    def __init__(self, rollouts: int | str = 300) -> None:
+        """Create the search opponent with the given simulations per move."""
+        super().__init__()
+        from mcts import MCTSOpponent
+
+        self.search = MCTSOpponent(time_budget=0.0, rollouts=int(rollouts))
+
+    def opponent_move(self, game: Game) -> None:
+        """Search from the opponent's decision point."""
+        self.search(game)
+
+
+class SolverStrategy(Strategy):
+    """Approximate best response to the built-in rules (solver.Solver), memoized across moves.
+
+    The solver draws with replacement from the full deck and maximizes the current round only, with
+    hand cards free to spend. It also reads the other seat's hand, so it is not a fair opponent.
+    """
+
+    name = "solver"
+
+    def __init__(self) -> None:
+        """Create the solver."""
+        super().__init__()
+        from solver import Solver
+
+        self.solver = Solver()
+
+    def player_action(self, game: Game) -> int:
+        """Play the solver's best action."""
+        return self.solver.best_action(game)
+
+
+class CFRPlugin(Strategy):
+    """Average strategy of a CFR run (cfr.CFRStrategy), loaded from its strategy file."""
+
+    name = "cfr"
+
+    def __init__(self, path: str = "strategy.bin") -> None:
+        """Map the strategy file."""
+        super().__init__()
+        from cfr import CFRStrategy
+
+        self.strategy = CFRStrategy(path, random.Random(0))
+
+    def player_action(self, game: Game) -> int:
+        """Play the player's seat from the strategy file."""
+        return self.strategy.player_policy(game)
+
+    def opponent_move(self, game: Game) -> None:
+        """Play the opponent's seat from the strategy file."""
+        self.strategy(game)
+
+
+# Registered plugins by name. A spec "name:argument" passes the argument to the plugin, e.g. cfr:strategy.bin.
+STRATEGIES: dict[str, type[Strategy]] = {
+    BaselineStrategy.name: BaselineStrategy,
+    MCTSStrategy.name: MCTSStrategy,
+    SolverStrategy.name: SolverStrategy,
+    CFRPlugin.name: CFRPlugin,
+}
+
+
+def register(strategy: type[Strategy]) -> type[Strategy]:
+    """Register a strategy class under its name; usable as a class decorator."""
+    STRATEGIES[strategy.name] = strategy
+    return strategy
+
+
+def create(spec: str) -> Strategy:
+    """Create a registered strategy from a "name" or "name:argument" spec."""
+    name, _, argument = spec.partition(":")
+    if name not in STRATEGIES:
+        raise ValueError(f"unknown strategy {name}; registered: {', '.join(sorted(STRATEGIES))}")
+    strategy: Strategy = STRATEGIES[name](argument) if argument else STRATEGIES[name]()
+    strategy.name = spec
+    return strategy
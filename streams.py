@@ -0,0 +1,131 @@
+import argparse
+import random
+import time
+from typing import Callable, Iterator
+
+import numpy as np
+
+from game import Game, MAIN_DECK_COUNTS, basic_player_policy
+
+# A match lasts at most 5 rounds of at most one full main deck each, plus the two 4-card hands, so a
+# slab of random values per match always covers it; the overflow stream is only a safety net.
+MATCH_DRAWS: int = 5 * sum(MAIN_DECK_COUNTS) + 8
+SLAB: int = 1 << (MATCH_DRAWS - 1).bit_length()
+# Matches whose slabs are generated in one call.
+BULK_MATCHES: int = 256
+
+
+class MatchRandom(random.Random):
+    """Injectable Game RNG that serves draws from bulk-generated PCG64 numbers, one fixed slab per match.
+
+    Match i uses values [i * SLAB, (i + 1) * SLAB) of the PCG64 stream of the seed, so any match can
+    be reproduced from (seed, i) by advancing the stream, without replaying the matches before it.
+    Values are generated for BULK_MATCHES matches at a time into one array, and a draw takes the next
+    value of the match's slab from an iterator rather than updating an index attribute, which is slow
+    on a random.Random subclass. Only randrange(n), which the engine uses for every draw, comes from
+    the stream; the other random.Random methods use the inherited generator seeded with the same seed.
+    """
+
+    __slots__ = ("stream_seed", "generator", "values", "first_match", "match", "draws", "overflow")
+
+    def __init__(self, seed: int = 0) -> None:
+        """Create the stream of a seed; start_match selects the match that draws come from."""
+        super().__init__(seed)
+        self.stream_seed: int = seed
+        self.generator: np.random.Generator | None = None
+        self.values: memoryview = memoryview(b"").cast("d")
+        self.first_match: int = 0
+        self.match: int = -1
+        self.draws: Iterator[float] = iter(())
+        self.overflow: np.random.Generator | None = None
+
+    def start_match(self, index: int | None = None) -> None:
+        """Move to the slab of a match: the given index, or the next match when None."""
+        if index is None:
+            index = self.match + 1
+        if not self.first_match <= index < self.first_match + len(self.values) // SLAB:
+            if self.generator is None or index != self.first_match + len(self.values) // SLAB:
+                bit_generator: np.random.PCG64 = np.random.PCG64(self.stream_seed)
+                bit_generator.advance(index * SLAB)
+                self.generator = np.random.Generator(bit_generator)
+            self.values = memoryview(self.generator.random(BULK_MATCHES * SLAB))
+            self.first_match = index
+        self.match = index
+        position: int = (index - self.first_match) * SLAB
+        self.draws = iter(self.values[position : position + SLAB])
+        self.overflow = None
+
+    def randrange(self, start: int, stop: int | None = None, step: int = 1) -> int:
+        """Return a uniform index below start from the current match's slab."""
+        if stop is not None or step != 1:
+            return super().randrange(start, stop, step)
+        value: float | None = next(self.draws, None)
+        if value is not None:
+            return int(value * start)
+        if self.overflow is None:
+            self.overflow = np.random.Generator(np.random.PCG64(self.stream_seed).jumped(self.match + 1))
+        return int(self.overflow.integers(start))
+
+
+def play_matches(
+    seed: int, matches: int, policy: Callable[[Game], int] = basic_player_policy, first: int = 0, **options: object
+) -> list[int]:
+    """Play matches first, first + 1, ... of a seed's stream and return their winners.
+
+    Extra keyword options are passed to Game, e.g. opponent_policy or recorder.
+    """
+    rng: MatchRandom = MatchRandom(seed)
+    game: Game = Game(rng, **options)
+    winners: list[int] = []
+    for index in range(first, first + matches):
+        rng.start_match(index)
+        winners.append(game.play_match(policy))
+    return winners
+
+
+def replay_match(
+    seed: int, index: int, policy: Callable[[Game], int] = basic_player_policy, **options: object
+) -> Game:
+    """Play match index of a seed's stream on a fresh game and return the game at its end."""
+    rng: MatchRandom = MatchRandom(seed)
+    game: Game = Game(rng, **options)
+    rng.start_match(index)
+    game.play_match(policy)
+    return game
+
+
+def main() -> None:
+    """Compare match throughput with the stream against random.Random and check that a match reproduces."""
+    parser = argparse.ArgumentParser(description="Benchmark and check the bulk PCG64 match streams.")
+    parser.add_argument("--matches", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5, help="alternating timing runs; the best of each is kept")
+    args = parser.parse_args()
+    baseline: float = float("inf")
+    streamed: float = float("inf")
+    for repeat in range(args.repeats):
+        game: Game = Game(random.Random(f"{args.seed}:{repeat}"))
+        started: float = time.perf_counter()
+        for _ in range(args.matches):
+            game.play_match(basic_player_policy)
+        baseline = min(baseline, time.perf_counter() - started)
+        started = time.perf_counter()
+        play_matches(args.seed, args.matches, first=repeat * args.matches)
+        streamed = min(streamed, time.perf_counter() - started)
+    print(
+        f"random.Random {args.matches / baseline:,.0f} matches/s, "
+        f"MatchRandom {args.matches / streamed:,.0f} matches/s (best of {args.repeats})"
+    )
+    index: int = args.matches - 1
+    events: list[tuple[int, int]] = []
+    play_matches(args.seed, 1, first=index, recorder=lambda event, value: events.append((event, value)))
+    replayed: list[tuple[int, int]] = []
+    replay_match(args.seed, index, recorder=lambda event, value: replayed.append((event, value)))
+    sequential: list[tuple[int, int]] = []
+    play_matches(args.seed, 3, first=index - 2, recorder=lambda event, value: sequential.append((event, value)))
+    tail: list[tuple[int, int]] = sequential[len(sequential) - len(events) :]
+    print(f"match {index} reproduced from (seed, index): {events == replayed == tail}")
+
+
+if __name__ == "__main__":
+    main()
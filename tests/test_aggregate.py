@@ -0,0 +1,47 @@
+from dataclasses import asdict
+
+import pytest
+
+from aggregate import OutcomeStats, aggregate_chunk, run_aggregate
+from tournament import CHUNK_SIZE
+
+MATCHES: int = 3 * CHUNK_SIZE + 500
+SEED: int = 7
+
+
+def test_resuming_from_a_checkpoint_gives_the_same_totals(tmp_path) -> None:
+    expected: OutcomeStats = run_aggregate(MATCHES, SEED, workers=1)
+    checkpoint: str = str(tmp_path / "run.json")
+    # A run interrupted after its first chunk, saved the way run_aggregate saves it.
+    aggregate_chunk(SEED, 0, CHUNK_SIZE).save(checkpoint, 1, SEED, MATCHES)
+    resumed: OutcomeStats = run_aggregate(MATCHES, SEED, workers=1, checkpoint=checkpoint)
+    assert asdict(resumed) == asdict(expected)
+    assert sum(resumed.matches) == MATCHES
+    stats, chunks_done, seed, matches = OutcomeStats.load(checkpoint)
+    assert (asdict(stats), chunks_done, seed, matches) == (asdict(expected), 4, SEED, MATCHES)
+
+
+def test_resume_skips_the_chunks_the_checkpoint_covers(tmp_path) -> None:
+    checkpoint: str = str(tmp_path / "run.json")
+    OutcomeStats().save(checkpoint, 2, SEED, MATCHES)
+    resumed: OutcomeStats = run_aggregate(MATCHES, SEED, workers=1, checkpoint=checkpoint)
+    assert sum(resumed.matches) == MATCHES - 2 * CHUNK_SIZE
+
+
+def test_merge_order_does_not_change_the_totals() -> None:
+    chunks: list[OutcomeStats] = [aggregate_chunk(SEED, index, 300) for index in range(3)]
+    forward: OutcomeStats = OutcomeStats()
+    backward: OutcomeStats = OutcomeStats()
+    for stats in chunks:
+        forward.merge(stats)
+    for stats in reversed(chunks):
+        backward.merge(stats)
+    assert asdict(forward) == asdict(backward)
+
+
+@pytest.mark.parametrize("seed, matches", [(SEED + 1, MATCHES), (SEED, MATCHES - 1000)])
+def test_checkpoint_of_another_run_is_rejected(tmp_path, seed: int, matches: int) -> None:
+    checkpoint: str = str(tmp_path / "run.json")
+    OutcomeStats().save(checkpoint, 0, SEED, MATCHES)
+    with pytest.raises(ValueError):
+        run_aggregate(matches, seed, workers=1, checkpoint=checkpoint)
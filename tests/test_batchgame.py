@@ -0,0 +1,25 @@
+import random
+
+import numpy as np
+
+from batchgame import BatchGame
+from game import Game, PLAYER, OPPONENT, TIE, basic_player_policy
+
+MATCHES: int = 20_000
+# Five standard errors of a difference of two rates near 0.5 over MATCHES matches each.
+TOLERANCE: float = 5 * (2 * 0.25 / MATCHES) ** 0.5
+
+
+def test_batch_and_scalar_outcome_rates_agree() -> None:
+    batch_winners: np.ndarray = BatchGame(MATCHES, np.random.default_rng(0)).play_matches()
+    game: Game = Game(random.Random(0))
+    scalar_winners: list[int] = [game.play_match(basic_player_policy) for _ in range(MATCHES)]
+    for result in (PLAYER, OPPONENT, TIE):
+        batch_rate: float = float(np.mean(batch_winners == result))
+        scalar_rate: float = scalar_winners.count(result) / MATCHES
+        assert abs(batch_rate - scalar_rate) < TOLERANCE, (result, batch_rate, scalar_rate)
+
+
+def test_every_batch_match_finishes() -> None:
+    winners: np.ndarray = BatchGame(1000, np.random.default_rng(1)).play_matches()
+    assert set(winners.tolist()) <= {PLAYER, OPPONENT, TIE}
@@ -0,0 +1,27 @@
+from dataclasses import asdict
+
+from aggregate import OutcomeStats, run_aggregate
+from cluster import Coordinator, run_cluster, run_shard
+from tournament import CHUNK_SIZE
+
+MATCHES: int = 5 * CHUNK_SIZE + 300
+SEED: int = 11
+
+
+def test_cluster_totals_equal_run_aggregate() -> None:
+    expected: OutcomeStats = run_aggregate(MATCHES, SEED, workers=1)
+    clustered: OutcomeStats = run_cluster(MATCHES, SEED, workers=2, shard_chunks=2)
+    assert asdict(clustered) == asdict(expected)
+
+
+def test_shards_cover_every_chunk_once() -> None:
+    coordinator: Coordinator = Coordinator(MATCHES, SEED, shard_chunks=4)
+    chunks: list[int] = [first + offset for first, count in coordinator.shards for offset in range(count)]
+    assert chunks == list(range((MATCHES + CHUNK_SIZE - 1) // CHUNK_SIZE))
+
+
+def test_shard_size_does_not_change_the_totals() -> None:
+    merged: OutcomeStats = OutcomeStats()
+    for index in range(3, 6):
+        merged.merge(run_shard(SEED, index, 1, MATCHES))
+    assert asdict(run_shard(SEED, 3, 3, MATCHES)) == asdict(merged)
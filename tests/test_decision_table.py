@@ -0,0 +1,31 @@
+import random
+
+from decision_table import OpponentTable, compare_speed
+from game import Game, basic_player_policy
+
+MATCHES: int = 2000
+
+
+def test_validated_table_matches_the_reference_rules(capsys) -> None:
+    # The same check as python decision_table.py --validate; any divergence raises ValueError.
+    compare_speed(MATCHES, 0, validate=True)
+    assert "table:" in capsys.readouterr().out
+
+
+def test_table_plays_the_same_matches_as_the_rules() -> None:
+    table: OpponentTable = OpponentTable()
+    reference: Game = Game(random.Random(3))
+    compiled: Game = Game(random.Random(3), table)
+    for _ in range(MATCHES):
+        assert compiled.play_match(basic_player_policy) == reference.play_match(basic_player_policy)
+        assert compiled.snapshot() == reference.snapshot()
+    assert table.misses == len(table.decisions)
+
+
+def test_full_table_is_cleared_and_refilled() -> None:
+    table: OpponentTable = OpponentTable(max_entries=50, validate=True)
+    game: Game = Game(random.Random(4), table)
+    for _ in range(200):
+        game.play_match(basic_player_policy)
+    assert len(table.decisions) <= 50
+    assert table.misses > 50
@@ -0,0 +1,76 @@
+import os
+import random
+
+import pytest
+
+from game import Game, EVENT_MATCH_END, basic_player_policy
+from matchlog import MatchLog, MatchLogWriter, index_path, read_records, replay
+
+MATCHES: int = 200
+
+
+def record(path: str, seed: int = 0) -> tuple[list[int], list[tuple[int, int]]]:
+    """Record seeded matches to a log and return their winners and the recorded events."""
+    events: list[tuple[int, int]] = []
+    with MatchLogWriter(path) as writer:
+
+        def recorder(event: int, value: int) -> None:
+            events.append((event, value))
+            writer(event, value)
+
+        game: Game = Game(random.Random(seed), recorder=recorder)
+        winners: list[int] = [game.play_match(basic_player_policy) for _ in range(MATCHES)]
+    return winners, events
+
+
+def replayed_winner(log: MatchLog, match_id: int) -> int:
+    """Replay one match of a log and return the winner of the replayed game."""
+    game: Game | None = None
+    for _, _, game in log.replay(match_id):
+        pass
+    return game.winner
+
+
+def test_log_stores_every_event(tmp_path) -> None:
+    path: str = str(tmp_path / "matches.log")
+    _, events = record(path)
+    assert [(event, value) for event, value in read_records(path)] == events
+
+
+def test_replay_reproduces_every_match(tmp_path) -> None:
+    path: str = str(tmp_path / "matches.log")
+    winners, _ = record(path)
+    log: MatchLog = MatchLog(path)
+    try:
+        assert len(log) == MATCHES
+        for match_id in range(MATCHES):
+            assert replayed_winner(log, match_id) == winners[match_id]
+    finally:
+        log.close()
+
+
+def test_missing_index_is_rebuilt(tmp_path) -> None:
+    path: str = str(tmp_path / "matches.log")
+    winners, _ = record(path)
+    os.remove(index_path(path))
+    log: MatchLog = MatchLog(path)
+    try:
+        assert len(log) == MATCHES
+        assert replayed_winner(log, MATCHES - 1) == winners[-1]
+    finally:
+        log.close()
+
+
+def test_tampered_log_fails_to_replay(tmp_path) -> None:
+    path: str = str(tmp_path / "matches.log")
+    record(path)
+    log: MatchLog = MatchLog(path)
+    try:
+        records: list[tuple[int, int]] = list(log.records(0))
+    finally:
+        log.close()
+    end: int = next(idx for idx, (event, _) in enumerate(records) if event == EVENT_MATCH_END)
+    event, winner = records[end]
+    records[end] = (event, winner + 1)
+    with pytest.raises(ValueError):
+        list(replay(records))
@@ -0,0 +1,47 @@
+from streams import BULK_MATCHES, MatchRandom, play_matches, replay_match
+
+
+def match_events(seed: int, index: int) -> list[tuple[int, int]]:
+    """Return the events of one match of a seed's stream, replayed on its own."""
+    events: list[tuple[int, int]] = []
+    replay_match(seed, index, recorder=lambda event, value: events.append((event, value)))
+    return events
+
+
+def test_streams_are_reproducible() -> None:
+    assert play_matches(3, 500) == play_matches(3, 500)
+    assert play_matches(3, 500) != play_matches(4, 500)
+
+
+def test_any_match_replays_from_seed_and_index() -> None:
+    events: list[tuple[int, int]] = []
+    first: int = BULK_MATCHES - 2
+    winners: list[int] = play_matches(5, 4, first=first, recorder=lambda event, value: events.append((event, value)))
+    replayed: list[tuple[int, int]] = []
+    replayed_winners: list[int] = []
+    for index in range(first, first + 4):
+        game_events: list[tuple[int, int]] = match_events(5, index)
+        replayed.extend(game_events)
+        replayed_winners.append(game_events[-1][1])
+    assert replayed == events
+    assert replayed_winners == winners
+
+
+def test_random_access_matches_sequential_draws() -> None:
+    sequential: MatchRandom = MatchRandom(9)
+    jumped: MatchRandom = MatchRandom(9)
+    for index in range(BULK_MATCHES + 3):
+        sequential.start_match()
+        draws: list[int] = [sequential.randrange(40) for _ in range(30)]
+        if index % 97 == 0 or index == BULK_MATCHES + 2:
+            jumped.start_match(index)
+            assert [jumped.randrange(40) for _ in range(30)] == draws
+
+
+def test_draws_past_the_slab_come_from_the_overflow_stream() -> None:
+    rng: MatchRandom = MatchRandom(2)
+    rng.start_match(0)
+    draws: list[int] = [rng.randrange(10) for _ in range(300)]
+    rng.start_match(0)
+    assert [rng.randrange(10) for _ in range(300)] == draws
+    assert all(0 <= draw < 10 for draw in draws)
@@ -0,0 +1,96 @@
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from game import Game, NO_RESULT, PLAYER, OPPONENT, basic_player_policy
+
+CHUNK_SIZE: int = 2000
+
+
+@dataclass(slots=True)
+class TournamentResult:
+    """Aggregated outcome counts of a batch of headless matches."""
+
+    matches: int = 0
+    player_wins: int = 0
+    opponent_wins: int = 0
+    draws: int = 0
+    rounds: int = 0
+
+    def merge(self, other: "TournamentResult") -> None:
+        """Add the counts of another result to this one."""
+        self.matches += other.matches
+        self.player_wins += other.player_wins
+        self.opponent_wins += other.opponent_wins
+        self.draws += other.draws
+        self.rounds += other.rounds
+
+
+def chunk_rng(seed: int, index: int) -> random.Random:
+    """Return the independent RNG stream for one chunk, derived only from the seed and the chunk index."""
+    return random.Random(f"pazaak:{seed}:{index}")
+
+
+def play_chunk(seed: int, index: int, matches: int) -> TournamentResult:
+    """Play one chunk of matches with its own seeded RNG and return the summary."""
+    game: Game = Game(chunk_rng(seed, index))
+    result: TournamentResult = TournamentResult(matches=matches)
+    for _ in range(matches):
+        game.reset_game()
+        while True:
+            game.play_round(basic_player_policy)
+            result.rounds += 1
+            if game.winner != NO_RESULT:
+                break
+            game.reset_round()
+        if game.winner == PLAYER:
+            result.player_wins += 1
+        elif game.winner == OPPONENT:
+            result.opponent_wins += 1
+        else:
+            result.draws += 1
+    return result
+
+
+def run_tournament(matches: int, seed: int = 0, workers: int | None = None) -> TournamentResult:
+    """Play matches headlessly across a process pool and merge the per-chunk summaries.
+
+    Matches are split into fixed-size chunks seeded by (seed, chunk index), so the merged result
+    only depends on the seed and the match count, never on the number of workers.
+    """
+    chunks: list[tuple[int, int]] = [
+        (index, min(CHUNK_SIZE, matches - start)) for index, start in enumerate(range(0, matches, CHUNK_SIZE))
+    ]
+    total: TournamentResult = TournamentResult()
+    if workers == 1:
+        for index, size in chunks:
+            total.merge(play_chunk(seed, index, size))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_chunk, seed, index, size) for index, size in chunks]
+        for future in futures:
+            total.merge(future.result())
+    return total
+
+
+def main() -> None:
+    """Run a tournament from the command line and print the summary."""
+    parser = argparse.ArgumentParser(description="Play headless Pazaak matches across worker processes.")
+    parser.add_argument("--matches", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    started: float = time.perf_counter()
+    result: TournamentResult = run_tournament(args.matches, args.seed, args.workers)
+    elapsed: float = time.perf_counter() - started
+    print(
+        f"matches={result.matches} player_wins={result.player_wins} opponent_wins={result.opponent_wins} "
+        f"draws={result.draws} rounds={result.rounds}"
+    )
+    print(f"{result.matches / elapsed:,.0f} matches/s in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import os
+import random
+import struct
+import threading
+
+from game import (
+    Game,
+    Snapshot,
+    PLAYER,
+    OPPONENT,
+    END_TURN,
+    STAND,
+    ZOBRIST_ROUNDS,
+    basic_player_policy,
+)
+
+TABLE_MAGIC: bytes = b"PZKW"
+TABLE_VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sI")
+# Key, then samples, summed round results and wins for drawing on (ending the turn) and for passing.
+RECORD: struct.Struct = struct.Struct("<QIfIIfI")
+OPTIONS: tuple[int, ...] = (END_TURN, STAND)
+RESULT_VALUES: dict[int, int] = {PLAYER: 1, OPPONENT: -1}
+
+
+def estimate_key(game: Game) -> int:
+    """Return the table key of the player's decision point: the position hash without the rounds won.
+
+    The position hash covers both totals, the remaining deck counts, both hands and the turn flags;
+    rounds won do not change the odds of the current round, so they are hashed back out.
+    """
+    return (
+        game.position_hash()
+        ^ ZOBRIST_ROUNDS[0][min(game.player_rounds_won, 3)]
+        ^ ZOBRIST_ROUNDS[1][min(game.opponent_rounds_won, 3)]
+    )
+
+
+class Estimate:
+    """Monte Carlo tallies of one decision point for drawing on and for passing."""
+
+    __slots__ = ("samples", "totals", "wins")
+
+    def __init__(
+        self, samples: list[int] | None = None, totals: list[float] | None = None, wins: list[int] | None = None
+    ) -> None:
+        """Start from the given tallies, indexed like OPTIONS, or from none."""
+        self.samples: list[int] = samples if samples is not None else [0, 0]
+        self.totals: list[float] = totals if totals is not None else [0.0, 0.0]
+        self.wins: list[int] = wins if wins is not None else [0, 0]
+
+    def value(self, option: int) -> float:
+        """Return the expected round result (1 win, 0 tie, -1 loss) of one option."""
+        return self.totals[option] / self.samples[option] if self.samples[option] else 0.0
+
+    def win_probability(self) -> float:
+        """Return the round win probability when taking the option with the better expected result."""
+        option: int = 0 if self.value(0) >= self.value(1) else 1
+        return self.wins[option] / self.samples[option] if self.samples[option] else 0.0
+
+    def sample_count(self) -> int:
+        """Return the fewest samples behind either option."""
+        return min(self.samples)
+
+
+class WinTable:
+    """Disk-persisted table of round win estimates, grown incrementally by Monte Carlo sampling.
+
+    Each sample restores the decision point on a scratch game, takes one option and plays the round
+    out with basic_player_policy against the built-in opponent rules, drawing the unknown cards from
+    the remaining deck counts. Methods may be called from a worker thread; the lock guards the dict.
+    """
+
+    def __init__(self, path: str | None = None, rng: random.Random | None = None) -> None:
+        """Load the table from path if it exists; it is saved back there by save."""
+        self.path: str | None = path
+        self.estimates: dict[int, Estimate] = {}
+        self.lock: threading.Lock = threading.Lock()
+        self.scratch: Game = Game(rng if rng is not None else random.Random())
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def get(self, key: int) -> Estimate | None:
+        """Return the estimate of a decision point, if any samples were taken."""
+        with self.lock:
+            return self.estimates.get(key)
+
+    def sample(self, key: int, snapshot: Snapshot, count: int) -> Estimate:
+        """Play count more rounds out from a decision point for each option and add them to its estimate."""
+        scratch: Game = self.scratch
+        samples: list[int] = [0, 0]
+        totals: list[float] = [0.0, 0.0]
+        wins: list[int] = [0, 0]
+        for option, action in enumerate(OPTIONS):
+            for _ in range(count):
+                scratch.restore(snapshot)
+                result: int = scratch.step(action)
+                if not scratch.round_ended:
+                    result = scratch.play_round(basic_player_policy)
+                samples[option] += 1
+                totals[option] += RESULT_VALUES.get(result, 0)
+                wins[option] += result == PLAYER
+        with self.lock:
+            estimate: Estimate = self.estimates.setdefault(key, Estimate())
+            for option in range(len(OPTIONS)):
+                estimate.samples[option] += samples[option]
+                estimate.totals[option] += totals[option]
+                estimate.wins[option] += wins[option]
+        return estimate
+
+    def load(self, path: str) -> None:
+        """Read the estimates stored in a table file."""
+        with open(path, "rb") as file:
+            data: bytes = file.read()
+        magic, version = HEADER.unpack_from(data, 0)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"{path} is not a version {TABLE_VERSION} win estimate table")
+        with self.lock:
+            for key, draws, draw_total, draw_wins, passes, pass_total, pass_wins in RECORD.iter_unpack(
+                data[HEADER.size :]
+            ):
+                self.estimates[key] = Estimate([draws, passes], [draw_total, pass_total], [draw_wins, pass_wins])
+
+    def save(self, path: str | None = None) -> None:
+        """Write all estimates to a table file, replacing it atomically."""
+        path = path if path is not None else self.path
+        if path is None:
+            return
+        with self.lock:
+            records: list[bytes] = [
+                RECORD.pack(
+                    key,
+                    estimate.samples[0],
+                    estimate.totals[0],
+                    estimate.wins[0],
+                    estimate.samples[1],
+                    estimate.totals[1],
+                    estimate.wins[1],
+                )
+                for key, estimate in self.estimates.items()
+            ]
+        temporary: str = path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(TABLE_MAGIC, TABLE_VERSION))
+            file.write(b"".join(records))
+        os.replace(temporary, path)
+
+
+class BackgroundEstimator:
+    """Worker thread that refines the estimate of the latest requested decision point.
+
+    request is cheap and never blocks: it only replaces the pending decision point. The worker
+    samples it in small batches until it has max_samples per option or a newer request arrives,
+    then sleeps until the next request.
+    """
+
+    def __init__(self, table: WinTable, batch: int = 25, max_samples: int = 2000) -> None:
+        """Start the daemon worker thread for the given table."""
+        self.table: WinTable = table
+        self.batch: int = batch
+        self.max_samples: int = max_samples
+        self.pending: tuple[int, Snapshot] | None = None
+        self.wakeup: threading.Condition = threading.Condition()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def request(self, game: Game) -> int:
+        """Ask for the estimate of the game's current decision point and return its key."""
+        key: int = estimate_key(game)
+        estimate: Estimate | None = self.table.get(key)
+        with self.wakeup:
+            if estimate is None or estimate.sample_count() < self.max_samples:
+                self.pending = (key, game.snapshot())
+                self.wakeup.notify()
+            else:
+                self.pending = None
+        return key
+
+    def cancel(self) -> None:
+        """Stop refining the current decision point, e.g. while the opponent moves."""
+        with self.wakeup:
+            self.pending = None
+
+    def run(self) -> None:
+        """Sample the pending decision point in batches until it is refined enough or replaced."""
+        while True:
+            with self.wakeup:
+                while self.pending is None:
+                    self.wakeup.wait()
+                key, snapshot = self.pending
+            estimate: Estimate = self.table.sample(key, snapshot, self.batch)
+            if estimate.sample_count() >= self.max_samples:
+                with self.wakeup:
+                    if self.pending is not None and self.pending[0] == key:
+                        self.pending = None